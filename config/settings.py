@@ -7,3 +7,11 @@ load_dotenv()
 # API Settings
 TWILIO_SID = os.getenv("TWILIO_ACCOUNT_SID")
 GEMINI_KEY = os.getenv("GEMINI_API_KEY")
+TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER", "+1234567890")
+
+# Google Cloud
+GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT", "Not set")
+
+# Deployment
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL")  # e.g. https://localai.up.railway.app
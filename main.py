@@ -6,9 +6,16 @@ Complete bilingual AI customer service system
 
 import os
 import sys
+import time
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
+from functools import partial
+from urllib.parse import parse_qsl
+from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 # Add src directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,21 +26,25 @@ sys.path.insert(0, src_dir)
 from dotenv import load_dotenv
 load_dotenv()
 
+# Settings resolved once at import instead of per request
+from config.settings import TWILIO_PHONE_NUMBER, GOOGLE_CLOUD_PROJECT, ENVIRONMENT, PUBLIC_BASE_URL
+
 # FastAPI imports
-from fastapi import FastAPI, Request, HTTPException, BackgroundTasks, Header, WebSocket
-from fastapi.responses import PlainTextResponse, HTMLResponse
+from fastapi import FastAPI, Request, HTTPException, Header, WebSocket
+from fastapi.responses import HTMLResponse, Response, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
+import orjson
+from prometheus_client import CollectorRegistry, Histogram, make_asgi_app, multiprocess
+from cachetools import TTLCache
 
 # Import your modules
 try:
-    from ai_processor import AIProcessor
-    from database import Database
-    from integrations.twilio_sms import TwilioSMS
-    from integrations.facebook_api import FacebookAPI
-    from dashboard import dashboard_router
-    # NEW: Import voice system
-    from enhanced_voice_system import EnhancedVoiceSystem, VoiceStreamHandler
+    from ai_processor import get_processor
+    from database import get_database, shutdown_writer
+    from db_pool import close_all as close_db_connections
+    # Twilio, Facebook, voice and dashboard modules are imported in
+    # initialize_components/startup so their SDKs don't weigh on cold start
     print("✅ All modules imported successfully")
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -51,12 +62,28 @@ logger = logging.getLogger(__name__)
 # FASTAPI APPLICATION SETUP
 # ================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup and shutdown (see STARTUP EVENTS below)"""
+    await startup_event()
+    yield
+    await shutdown_event()
+
 app = FastAPI(
     title="LocalAI Assistant - Voice & SMS",
     description="AI-powered bilingual customer service with voice and SMS",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Worker threads for blocking AI/DB calls (sized to Gemini concurrency)
+AI_EXECUTOR_WORKERS = 16
+
+# SMS processing pool: pending messages beyond SMS_QUEUE_MAXSIZE get a 429
+SMS_WORKERS = 8
+SMS_QUEUE_MAXSIZE = 1000
+
 # Initialize components
 ai_processor = None
 database = None
@@ -65,9 +92,14 @@ facebook_api = None
 voice_system = None
 voice_handler = None
 
+def _log_component_ready(name: str, future):
+    """Log each component as soon as its constructor finishes"""
+    if future.exception() is None:
+        logger.info(f"✅ {name} initialized")
+
 def initialize_components():
     """Initialize all components including voice system"""
-    global ai_processor, database, twilio_sms, facebook_api, voice_system, voice_handler
+    global ai_processor, database, twilio_sms, facebook_api, voice_system, voice_handler, _ROOT_JSON
     
     try:
         logger.info("🔄 Initializing components...")
@@ -80,26 +112,45 @@ def initialize_components():
             logger.error(f"❌ Missing environment variables: {missing_vars}")
             raise ValueError(f"Missing required environment variables: {missing_vars}")
         
-        # Initialize AI Processor
-        ai_processor = AIProcessor()
-        logger.info("✅ AI Processor initialized")
-        
-        # Initialize Database
-        database = Database()
-        logger.info("✅ Database initialized")
-        
-        # Initialize Twilio SMS
-        twilio_sms = TwilioSMS()
-        logger.info("✅ Twilio SMS initialized")
+        # Deferred imports: the Twilio and Google Cloud SDKs load here, not at module import
+        from integrations.twilio_sms import TwilioSMS
+        from integrations.facebook_api import FacebookAPI
+        from enhanced_voice_system import EnhancedVoiceSystem, VoiceStreamHandler
+        
+        # Constructors are independent (credential loading, client setup),
+        # so build them concurrently: startup costs the slowest one, not the sum
+        constructors = {
+            'AI Processor': get_processor,
+            'Database': get_database,
+            'Twilio SMS': TwilioSMS,
+            'Facebook API': FacebookAPI,
+            'Voice System': EnhancedVoiceSystem,
+        }
+        components = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=len(constructors)) as executor:
+            futures = {name: executor.submit(factory) for name, factory in constructors.items()}
+            for name, future in futures.items():
+                future.add_done_callback(partial(_log_component_ready, name))
+        
+        # One failure must not discard the components that did come up
+        for name, future in futures.items():
+            try:
+                components[name] = future.result()
+            except Exception as e:
+                logger.error(f"❌ {name} initialization failed: {str(e)}")
+                failed.append(name)
         
-        # Initialize Facebook API
-        facebook_api = FacebookAPI()
-        logger.info("✅ Facebook API initialized")
+        ai_processor = components.get('AI Processor')
+        database = components.get('Database')
+        twilio_sms = components.get('Twilio SMS')
+        facebook_api = components.get('Facebook API')
+        voice_system = components.get('Voice System')
+        voice_handler = VoiceStreamHandler(voice_system) if voice_system else None
+        _ROOT_JSON = _build_root_json()
         
-        # NEW: Initialize Voice System
-        voice_system = EnhancedVoiceSystem()
-        voice_handler = VoiceStreamHandler(voice_system)
-        logger.info("✅ Voice System initialized")
+        if failed:
+            raise RuntimeError(f"Failed components: {failed}")
         
         logger.info("🎉 All components initialized successfully!")
         return True
@@ -108,23 +159,34 @@ def initialize_components():
         logger.error(f"❌ Component initialization failed: {str(e)}")
         return False
 
+# Prometheus metrics. Each uvicorn worker keeps its own samples; with
+# PROMETHEUS_MULTIPROC_DIR set (an empty directory shared by the workers),
+# /metrics aggregates all of them instead of answering for one worker
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+def _metrics_app():
+    """ASGI app serving /metrics, merged across workers in multiprocess mode"""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return make_asgi_app()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return make_asgi_app(registry=registry)
+
+app.mount("/metrics", _metrics_app())
+
 # Serve static files
 try:
     app.mount("/static", StaticFiles(directory="static"), name="static")
 except Exception:
     logger.warning("Static files directory not found")
 
-# Include dashboard router
-app.include_router(dashboard_router, prefix="")
-
 # ================================
 # API ROUTES
 # ================================
 
-@app.get("/")
-async def root():
-    """API root endpoint"""
-    return {
+def _build_root_json() -> bytes:
+    """Serialize the root status payload for the current components"""
+    payload = {
         "message": "LocalAI Assistant - Voice & SMS AI Customer Service",
         "status": "running",
         "version": "2.0.0",
@@ -151,11 +213,35 @@ async def root():
             "health": "GET /health"
         }
     }
+    return orjson.dumps(payload)
+
+# Rebuilt by initialize_components; served as-is on every hit
+_ROOT_JSON = _build_root_json()
+
+@app.get("/")
+async def root():
+    """API root endpoint"""
+    return Response(content=_ROOT_JSON, media_type="application/json")
+
+# Probes hit /health every few seconds; a successful AI/DB check is reused
+# for HEALTH_PROBE_TTL seconds instead of paying a Gemini call per probe
+HEALTH_PROBE_TTL = 30
+HEALTH_PROBE_TIMEOUT = 2.0
+_HEALTH_TEST_BUSINESS = {
+    "name": "Test Business",
+    "services": ["test"],
+    "hours": "9-5",
+    "address": "Test Address"
+}
+_last_ai_ok_ts = 0.0
+_last_db_ok_ts = 0.0
 
 @app.get("/health")
 async def health_check():
     """Comprehensive health check"""
+    global _last_ai_ok_ts, _last_db_ok_ts
     try:
+        now = time.monotonic()
         health_status = {
             "status": "healthy",
             "version": "2.0.0",
@@ -164,21 +250,23 @@ async def health_check():
             "voice_enabled": voice_system is not None,
             "google_cloud": {
                 "credentials": bool(os.getenv('GOOGLE_APPLICATION_CREDENTIALS')),
-                "project": os.getenv('GOOGLE_CLOUD_PROJECT', 'Not set')
+                "project": GOOGLE_CLOUD_PROJECT
             }
         }
         
         # Check AI Processor
         if ai_processor:
             try:
-                test_business = {
-                    "name": "Test Business",
-                    "services": ["test"],
-                    "hours": "9-5",
-                    "address": "Test Address"
-                }
-                test_response = await ai_processor.generate_response("hello", test_business)
+                if now - _last_ai_ok_ts >= HEALTH_PROBE_TTL:
+                    await asyncio.wait_for(
+                        ai_processor.generate_response("hello", _HEALTH_TEST_BUSINESS),
+                        timeout=HEALTH_PROBE_TIMEOUT
+                    )
+                    _last_ai_ok_ts = time.monotonic()
                 health_status["components"]["ai_processor"] = "✅ Ready"
+            except asyncio.TimeoutError:
+                health_status["components"]["ai_processor"] = "❌ Error: probe timed out"
+                health_status["status"] = "degraded"
             except Exception as e:
                 health_status["components"]["ai_processor"] = f"❌ Error: {str(e)}"
                 health_status["status"] = "degraded"
@@ -189,8 +277,16 @@ async def health_check():
         # Check Database
         if database:
             try:
-                business = await database.get_business_by_phone(os.getenv('TWILIO_PHONE_NUMBER', '+1234567890'))
+                if now - _last_db_ok_ts >= HEALTH_PROBE_TTL:
+                    await asyncio.wait_for(
+                        database.get_business_by_phone(TWILIO_PHONE_NUMBER),
+                        timeout=HEALTH_PROBE_TIMEOUT
+                    )
+                    _last_db_ok_ts = time.monotonic()
                 health_status["components"]["database"] = "✅ Connected"
+            except asyncio.TimeoutError:
+                health_status["components"]["database"] = "❌ Error: probe timed out"
+                health_status["status"] = "degraded"
             except Exception as e:
                 health_status["components"]["database"] = f"❌ Error: {str(e)}"
                 health_status["status"] = "degraded"
@@ -214,52 +310,99 @@ async def health_check():
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(status_code=503, detail=f"Service unhealthy: {str(e)}")
 
+# ================================
+# TWILIO HELPERS
+# ================================
+
+async def _twilio_form(request: Request) -> Dict[str, str]:
+    """Parse Twilio's urlencoded webhook body without the multipart parser"""
+    raw = await request.body()
+    return dict(parse_qsl(raw.decode('utf-8'), keep_blank_values=True))
+
+def _extract(form_data: Dict[str, str], *keys: str) -> tuple:
+    """Pull several Twilio fields in one pass (None for missing ones)"""
+    get = form_data.get
+    return tuple(get(key) for key in keys)
+
+def _twilio_request_url(request: Request) -> str:
+    """URL Twilio signed: the public one, so honor the proxy's X-Forwarded-Proto"""
+    url = str(request.url)
+    proto = request.headers.get('x-forwarded-proto')
+    if proto and not url.startswith(proto + '://'):
+        url = proto + url[url.index('://'):]
+    return url
+
+def _base_url_from_host(request: Request) -> str:
+    """Fallback base URL when PUBLIC_BASE_URL isn't configured"""
+    host = request.headers.get('host', 'localhost:8000')
+    return f"https://{host}" if 'railway.app' in host else f"http://{host}"
+
+async def _verified_twilio_form(request: Request, signature: str) -> Dict[str, str]:
+    """Parse the webhook body and reject forged requests before any work is done"""
+    # No validator means no way to tell a forged request apart: refuse them all
+    if not twilio_sms:
+        raise HTTPException(status_code=503, detail="Twilio not initialized")
+    form_data = await _twilio_form(request)
+    if not twilio_sms.validate_signature(_twilio_request_url(request), form_data, signature):
+        logger.warning("🚫 Invalid Twilio signature on %s", request.url.path)
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+    return form_data
+
 # ================================
 # VOICE WEBHOOKS
 # ================================
 
+# Fallback TwiML for voice webhook errors, encoded once
+_FALLBACK_TWIML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say voice="Polly.Joanna" language="en-US">
+        Thank you for calling. We're experiencing technical difficulties. 
+        Please try calling back in a few minutes or send us a text message.
+    </Say>
+</Response>'''
+
+# Welcome TwiML only varies by call SID: render it once per base URL with a
+# sentinel and splice the SID in as bytes. Bounded because base_url can come
+# from the Host header when PUBLIC_BASE_URL isn't set.
+_TWIML_SID_SENTINEL = b"__SID__"
+_TWIML_TEMPLATE_LIMIT = 8
+_twiml_templates: Dict[str, bytes] = {}
+
+def _welcome_twiml_template(base_url: str) -> bytes:
+    """Welcome TwiML for base_url with _TWIML_SID_SENTINEL in place of the call SID"""
+    template = _twiml_templates.get(base_url)
+    if template is None:
+        template = voice_system.create_welcome_twiml(_TWIML_SID_SENTINEL.decode(), base_url).encode('utf-8')
+        if len(_twiml_templates) < _TWIML_TEMPLATE_LIMIT:
+            _twiml_templates[base_url] = template
+    return template
+
 @app.post("/webhook/voice")
-async def handle_voice_call(request: Request):
+async def handle_voice_call(request: Request, x_twilio_signature: str = Header(None)):
     """Handle incoming voice calls from Twilio"""
+    form_data = await _verified_twilio_form(request, x_twilio_signature)
     try:
         if not voice_system:
             raise HTTPException(status_code=503, detail="Voice system not initialized")
         
-        form_data = await request.form()
-        call_sid = form_data.get('CallSid')
-        from_number = form_data.get('From')
-        to_number = form_data.get('To')
+        call_sid, from_number, to_number = _extract(form_data, 'CallSid', 'From', 'To')
         
-        logger.info(f"📞 Voice call: {from_number} -> {to_number} (SID: {call_sid})")
+        logger.info("📞 Voice call: %s -> %s (SID: %s)", from_number, to_number, call_sid)
         
-        # Get the base URL for websocket
-        host = request.headers.get('host', 'localhost:8000')
-        base_url = f"https://{host}" if 'railway.app' in host else f"http://{host}"
+        # Get the base URL for websocket (fixed in production via PUBLIC_BASE_URL)
+        base_url = PUBLIC_BASE_URL or _base_url_from_host(request)
         
         # Create TwiML response for real-time voice
-        twiml_response = voice_system.create_welcome_twiml(call_sid, base_url)
-        
-        return PlainTextResponse(
-            content=twiml_response,
-            media_type="application/xml"
+        twiml_response = _welcome_twiml_template(base_url).replace(
+            _TWIML_SID_SENTINEL, escape(call_sid, {'"': '&quot;'}).encode('utf-8')
         )
         
+        return Response(content=twiml_response, media_type="application/xml")
+        
     except Exception as e:
-        logger.error(f"❌ Voice webhook error: {str(e)}")
-        
-        # Fallback TwiML for errors
-        fallback_twiml = '''<?xml version="1.0" encoding="UTF-8"?>
-        <Response>
-            <Say voice="Polly.Joanna" language="en-US">
-                Thank you for calling. We're experiencing technical difficulties. 
-                Please try calling back in a few minutes or send us a text message.
-            </Say>
-        </Response>'''
-        
-        return PlainTextResponse(
-            content=fallback_twiml,
-            media_type="application/xml"
-        )
+        logger.error("❌ Voice webhook error: %s", e)
+        
+        return Response(content=_FALLBACK_TWIML, media_type="application/xml")
 
 @app.websocket("/voice/stream/{call_sid}")
 async def voice_stream_websocket(websocket: WebSocket, call_sid: str):
@@ -269,42 +412,79 @@ async def voice_stream_websocket(websocket: WebSocket, call_sid: str):
         return
     
     await websocket.accept()
-    logger.info(f"🎙️ Voice stream connected for call {call_sid}")
+    logger.info("🎙️ Voice stream connected for call %s", call_sid)
     
     try:
         await voice_handler.handle_websocket(websocket, call_sid)
     except Exception as e:
-        logger.error(f"❌ Voice stream error: {str(e)}")
+        logger.error("❌ Voice stream error: %s", e)
     finally:
         await websocket.close()
 
+# Terminal status callbacks for a call arrive in bursts (retries, several
+# statuses); cleanup runs once, CALL_END_DEBOUNCE seconds after the last one
+CALL_END_DEBOUNCE = 0.25
+_pending_call_ends: Dict[str, asyncio.TimerHandle] = {}
+_call_end_tasks = set()
+
+async def _run_call_end(call_sid: str):
+    """Call cleanup for a finished call, logging instead of raising"""
+    try:
+        await voice_system.handle_call_end(call_sid)
+    except Exception as e:
+        logger.error("❌ Call end cleanup error for %s: %s", call_sid, e)
+
+def _fire_call_end(call_sid: str):
+    """Debounce timer expired: start the cleanup task"""
+    _pending_call_ends.pop(call_sid, None)
+    if voice_system:
+        task = asyncio.ensure_future(_run_call_end(call_sid))
+        _call_end_tasks.add(task)
+        task.add_done_callback(_call_end_tasks.discard)
+
+def _schedule_call_end(call_sid: str):
+    """(Re)arm the debounce timer for call_sid"""
+    handle = _pending_call_ends.pop(call_sid, None)
+    if handle:
+        handle.cancel()
+    loop = asyncio.get_running_loop()
+    _pending_call_ends[call_sid] = loop.call_later(CALL_END_DEBOUNCE, _fire_call_end, call_sid)
+
 @app.post("/voice/status")
-async def voice_call_status(request: Request):
+async def voice_call_status(request: Request, x_twilio_signature: str = Header(None)):
     """Handle call status updates from Twilio"""
+    form_data = await _verified_twilio_form(request, x_twilio_signature)
     try:
-        form_data = await request.form()
-        call_sid = form_data.get('CallSid')
-        call_status = form_data.get('CallStatus')
+        call_sid, call_status = _extract(form_data, 'CallSid', 'CallStatus')
         
-        logger.info(f"📞 Call {call_sid} status: {call_status}")
+        logger.info("📞 Call %s status: %s", call_sid, call_status)
         
         if call_status in ['completed', 'failed', 'canceled'] and voice_system:
-            await voice_system.handle_call_end(call_sid)
+            _schedule_call_end(call_sid)
         
-        return PlainTextResponse("OK", status_code=200)
+        return Response(content=b"OK", media_type="text/plain", status_code=200)
         
     except Exception as e:
-        logger.error(f"❌ Voice status error: {str(e)}")
-        return PlainTextResponse("Error", status_code=500)
+        logger.error("❌ Voice status error: %s", e)
+        return Response(content=b"Error", media_type="text/plain", status_code=500)
 
 # ================================
 # SMS WEBHOOKS (EXISTING)
 # ================================
 
+# MessageSids accepted in the last 10 minutes (per process)
+_seen_message_sids: TTLCache = TTLCache(maxsize=10000, ttl=600)
+
+class SmsData(NamedTuple):
+    """Inbound SMS fields handed from the webhook to the worker pool"""
+    from_: str
+    to: str
+    body: str  # already stripped
+    sid: str
+
 @app.post("/webhook/sms")
 async def handle_sms_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     x_twilio_signature: str = Header(None)
 ):
     """SMS webhook handler (existing functionality)"""
@@ -312,56 +492,76 @@ async def handle_sms_webhook(
         if not ai_processor or not database or not twilio_sms:
             raise HTTPException(status_code=503, detail="Components not properly initialized")
         
-        # Parse Twilio form data
-        form_data = await request.form()
-        sms_data = {
-            'From': form_data.get('From'),
-            'To': form_data.get('To'),
-            'Body': form_data.get('Body', ''),
-            'MessageSid': form_data.get('MessageSid')
-        }
+        # Parse Twilio form data (403 on a bad signature)
+        form_data = await _verified_twilio_form(request, x_twilio_signature)
+        sms_data = SmsData(
+            form_data.get('From'),
+            form_data.get('To'),
+            form_data.get('Body', '').strip(),
+            form_data.get('MessageSid')
+        )
         
-        logger.info(f"📱 SMS webhook received from {sms_data['From']}")
+        logger.info("📱 SMS webhook received from %s", sms_data.from_)
         
-        # Process message in background
-        background_tasks.add_task(process_sms_message, sms_data)
+        # Twilio retry of a message we already accepted: ack without reprocessing
+        if sms_data.sid and sms_data.sid in _seen_message_sids:
+            logger.info("🔁 Duplicate SMS %s ignored", sms_data.sid)
+            return Response(content=b"", media_type="text/plain", status_code=200)
         
-        return PlainTextResponse("", status_code=200)
+        # Hand off to the SMS worker pool; a full queue means we're saturated
+        try:
+            app.state.sms_queue.put_nowait(sms_data)
+        except asyncio.QueueFull:
+            logger.warning("⚠️ SMS queue full - rejecting message from %s", sms_data.from_)
+            return Response(content=b"Busy", media_type="text/plain", status_code=429)
+        
+        # Marked only once queued, so a 429'd message is still accepted on retry
+        if sms_data.sid:
+            _seen_message_sids[sms_data.sid] = True
+        
+        return Response(content=b"", media_type="text/plain", status_code=200)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ SMS webhook error: {str(e)}")
-        return PlainTextResponse("Error", status_code=500)
+        logger.error("❌ SMS webhook error: %s", e)
+        return Response(content=b"Error", media_type="text/plain", status_code=500)
 
 # ================================
 # BACKGROUND TASKS
 # ================================
 
-async def process_sms_message(sms_data: Dict[str, Any]):
+# Per-stage latency of the SMS pipeline, scraped from /metrics
+SMS_STAGE = Histogram('sms_stage_seconds', 'SMS pipeline stage latency', ['stage'])
+
+async def process_sms_message(sms_data: SmsData):
     """Process SMS using existing modules"""
+    # Bind the components once: locals are LOAD_FAST, globals a dict lookup each use.
+    # Bound at call time (not as default args) because startup reassigns the globals.
+    db, ai, tw, log, stage, perf_ns = database, ai_processor, twilio_sms, logger, SMS_STAGE, time.perf_counter_ns
     try:
-        start_time = datetime.now()
+        start_ns = perf_ns()
         
-        customer_phone = sms_data.get('From')
-        business_phone = sms_data.get('To')
-        message_text = sms_data.get('Body', '').strip()
+        customer_phone = sms_data.from_
+        business_phone = sms_data.to
+        message_text = sms_data.body
         
-        logger.info(f"🔄 Processing SMS from {customer_phone}")
+        log.info("🔄 Processing SMS from %s", customer_phone)
         
         # Get business using database
-        business = await database.get_business_by_phone(business_phone)
+        with stage.labels('db_get').time():
+            business = await db.get_business_by_phone(business_phone)
         if not business:
-            logger.warning(f"⚠️ No business found for phone {business_phone}")
+            log.warning("⚠️ No business found for phone %s", business_phone)
             return
         
         # Generate AI response
-        ai_response = await ai_processor.generate_response(message_text, business)
+        with stage.labels('ai').time():
+            ai_response = await ai.generate_response(message_text, business)
         
         # Calculate processing time
-        processing_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        processing_time_ms = (perf_ns() - start_ns) // 1_000_000
         
-        # Log conversation
         conversation_data = {
             'business_id': business['id'],
             'customer_phone': customer_phone,
@@ -373,37 +573,82 @@ async def process_sms_message(sms_data: Dict[str, Any]):
             'escalated': ai_response.escalate
         }
         
-        await database.log_conversation(conversation_data, processing_time_ms)
-        
-        # Send SMS response
-        sms_result = await twilio_sms.send_sms(
-            to_phone=customer_phone,
-            message=ai_response.text,
-            from_phone=business_phone
-        )
-        
-        logger.info(f"✅ SMS processed in {processing_time_ms}ms")
-        logger.info(f"📤 Response: {ai_response.text}")
-        logger.info(f"🎯 Intent: {ai_response.intent} | Confidence: {ai_response.confidence:.2f}")
+        # Log conversation and send the SMS reply concurrently; a logging
+        # failure must not cost the customer their reply
+        with stage.labels('log_and_send').time():
+            log_result, sms_result = await asyncio.gather(
+                db.log_conversation(conversation_data, processing_time_ms),
+                tw.send_sms(
+                    to_phone=customer_phone,
+                    message=ai_response.text,
+                    from_phone=business_phone
+                ),
+                return_exceptions=True
+            )
+        if isinstance(log_result, Exception):
+            log.error("❌ Conversation logging failed: %s", log_result)
+        if isinstance(sms_result, Exception):
+            log.error("❌ SMS send failed: %s", sms_result)
+        
+        if log.isEnabledFor(logging.INFO):
+            log.info("✅ SMS processed in %sms", processing_time_ms)
+            log.info("📤 Response: %s", ai_response.text)
+            log.info("🎯 Intent: %s | Confidence: %.2f", ai_response.intent, ai_response.confidence)
         
         if ai_response.escalate:
-            logger.warning(f"🚨 Message escalated - human attention required")
+            log.warning("🚨 Message escalated - human attention required")
         
     except Exception as e:
-        logger.error(f"❌ SMS processing error: {str(e)}")
+        log.error("❌ SMS processing error: %s", e)
+
+async def _sms_worker(queue: asyncio.Queue):
+    """Drain the SMS queue one message at a time"""
+    while True:
+        sms_data = await queue.get()
+        try:
+            await process_sms_message(sms_data)
+        finally:
+            queue.task_done()
 
 # ================================
 # STARTUP EVENTS
 # ================================
 
-@app.on_event("startup")
 async def startup_event():
     """Initialize system on startup"""
     logger.info("🚀 Starting LocalAI Assistant with Voice & SMS support...")
     logger.info("=" * 70)
     
-    # Initialize components
-    success = initialize_components()
+    # One bounded pool for blocking work (Gemini calls, SQLite writes); made the
+    # loop default so run_in_executor(None, ...) anywhere in src/ lands here
+    app.state.executor = ThreadPoolExecutor(max_workers=AI_EXECUTOR_WORKERS, thread_name_prefix="ai")
+    asyncio.get_running_loop().set_default_executor(app.state.executor)
+    
+    # Bounded queue + fixed worker pool: SMS bursts get backpressure instead of
+    # an unbounded number of concurrent AI/DB/Twilio calls
+    app.state.sms_queue = asyncio.Queue(maxsize=SMS_QUEUE_MAXSIZE)
+    app.state.sms_workers = [
+        asyncio.create_task(_sms_worker(app.state.sms_queue)) for _ in range(SMS_WORKERS)
+    ]
+    
+    # Initialize components off the event loop; the constructors themselves
+    # already run concurrently inside initialize_components
+    success = await asyncio.to_thread(initialize_components)
+    
+    # Open the Gemini connection before the first customer message arrives
+    if ai_processor:
+        app.state.ai_keepalive = asyncio.create_task(ai_processor.keep_warm())
+    
+    # Popular-questions summary: built now, then rebuilt hourly
+    if database:
+        app.state.intent_summary_refresh = asyncio.create_task(database.keep_intent_summary_fresh())
+    
+    # Dashboard router is imported lazily and mounted once the app is starting
+    try:
+        from dashboard import dashboard_router
+        app.include_router(dashboard_router, prefix="")
+    except ImportError as e:
+        logger.error(f"❌ Dashboard import failed: {str(e)}")
     
     if success:
         logger.info("=" * 70)
@@ -420,10 +665,30 @@ async def startup_event():
     else:
         logger.error("❌ Failed to initialize components - check your configuration")
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("🛑 Shutting down LocalAI Assistant...")
+    workers = list(getattr(app.state, "sms_workers", []))
+    for name in ("ai_keepalive", "intent_summary_refresh"):
+        task = getattr(app.state, name, None)
+        if task:
+            workers.append(task)
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    # Commit conversation rows still waiting in the batched writer
+    # (before the pooled SQLite connections are closed)
+    if database:
+        await database.flush()
+    executor = getattr(app.state, "executor", None)
+    if executor:
+        executor.shutdown(wait=False)
+    # A cancelled refresh or flush may still be running on the SQLite writer thread
+    shutdown_writer()
+    close_db_connections()
+    if PROMETHEUS_MULTIPROC_DIR:
+        # Drop this worker's live-gauge files; its counters and histograms stay aggregated
+        multiprocess.mark_process_dead(os.getpid())
 
 # ================================
 # MAIN ENTRY POINT
@@ -435,10 +700,25 @@ if __name__ == "__main__":
     print("🔧 Voice calls + SMS messages + Smart transfers")
     print("🚀 Starting enhanced server...")
     
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=int(os.getenv("PORT", 8000)),
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    port = int(os.getenv("PORT", 8000))
+    
+    if ENVIRONMENT == "production":
+        # One worker per core on uvloop + httptools (both ship with uvicorn[standard])
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level="info",
+            access_log=False
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            reload=True,
+            log_level="info"
+        )
\ No newline at end of file
@@ -6,19 +6,556 @@ Perfect for Quebec/bilingual businesses
 """
 
 import os
-import json
 import re
+import sys
+import asyncio
 import logging
+import functools
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, NamedTuple, FrozenSet
 
 # AI/ML imports
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 from dataclasses import dataclass
+from cachetools import TTLCache
+import orjson
+
+# Multi-keyword matching (Aho-Corasick)
+import ahocorasick
+
+# Optional fastText language ID (pip install fasttext-wheel + the lid.176.ftz model);
+# without it detect_language keeps the keyword vote
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+LANGID_MODEL_PATH = os.getenv("LANGID_MODEL_PATH", "lid.176.ftz")
+# Short plain-ASCII texts ("ok", "yes 3pm") skip the model: the keyword vote handles them
+LANGID_MIN_CHARS = 20
+
+# Caps in-flight Gemini calls so bursts queue here instead of tripping API rate limits
+_AI_SEM = asyncio.Semaphore(int(os.getenv("AI_CONCURRENCY", 4)))
+
+# Request-rate cap in front of the semaphore (0 disables), and how a 429 that
+# still gets through is retried: exponential backoff, holding the slot
+GEMINI_RATE_PER_SECOND = float(os.getenv("GEMINI_RATE_PER_SECOND", 10))
+GEMINI_MAX_RETRIES = 3
+GEMINI_BACKOFF_SECONDS = 0.5
+
+class _TokenBucket:
+    """Async token bucket: rate calls per second on average, bursts up to capacity"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = None
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.updated is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+_RATE_LIMITER = _TokenBucket(GEMINI_RATE_PER_SECOND, max(GEMINI_RATE_PER_SECOND, 1)) if GEMINI_RATE_PER_SECOND > 0 else None
+
+# Classification micro-batching: up to AI_CLASSIFY_BATCH_SIZE concurrent messages
+# arriving within AI_CLASSIFY_FLUSH_MS share one Gemini call. 1 (default) keeps
+# one call per message, which is lowest latency for a single conversation
+CLASSIFY_BATCH_SIZE = int(os.getenv("AI_CLASSIFY_BATCH_SIZE", 1))
+CLASSIFY_FLUSH_SECONDS = int(os.getenv("AI_CLASSIFY_FLUSH_MS", 50)) / 1000
+
+# Replies are SMS-sized: stop streaming once this many characters have arrived,
+# trim back to the last full sentence, and cap server-side generation to match
+SMS_REPLY_CHARS = 160
+_REPLY_GENERATION_CONFIG = {"max_output_tokens": 80, "temperature": 0.3}
+
+# A sentence end: terminal punctuation followed by whitespace or the end of the
+# text (so "45.50" or "514.555.1234" don't count)
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s|$)")
+
+def _trim_reply(text: str, max_chars: int) -> str:
+    """text cut to its last sentence end within max_chars (a hard cut when no
+    sentence ends in time)"""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    end = 0
+    # One character of lookahead past the budget decides whether the last one ends a sentence
+    for match in _SENTENCE_END_RE.finditer(text[:max_chars + 1]):
+        if match.end() <= max_chars:
+            end = match.end()
+    return text[:end] if end else text[:max_chars].rstrip()
+
+# Gemini connection warm-up: one tiny call at startup so the first customer
+# doesn't pay DNS + TLS, repeated so the idle channel isn't dropped (0 = startup only)
+GEMINI_KEEPALIVE_SECONDS = int(os.getenv("GEMINI_KEEPALIVE_SECONDS", 240))
+_WARMUP_GENERATION_CONFIG = {"max_output_tokens": 1}
+
+# Reply cache for repeated phrasings ("what are your hours?"); the TTL bounds
+# how long an edited business profile can keep serving an old answer
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL = 600
+
+# Accent/apostrophe fold applied to lowercased messages and to every keyword, so
+# "deçu", "decu" and "déçu" (or "j’ai" and "j'ai") match the same entry. 'ù' is
+# left alone: its only keyword is "où", and folded to "ou" it would collide with
+# "ou" (or) and every "you"/"hour"
+_FOLD = str.maketrans("àâäéèêëîïôöûüÿç’", "aaaeeeeiioouuyc'")
+
+def _fold(text: str) -> str:
+    """Accent-fold lowercase text with _FOLD"""
+    return text.translate(_FOLD)
+
+# Words of a message: letters/digits, keeping elisions and hyphens ("j'ai", "rendez-vous")
+_WORD_RE = re.compile(r"[\w'-]+")
+
+# French indicators for language detection (more comprehensive), matched as whole words
+_FRENCH_WORDS = frozenset(_fold(word) for word in [
+    # Greetings & politeness
+    'bonjour', 'bonsoir', 'salut', 'merci', 'svp', 's\'il', 'plaît',
+    # Questions words
+    'comment', 'quand', 'où', 'pourquoi', 'combien', 'quel', 'quelle',
+    # Common words
+    'oui', 'non', 'je', 'nous', 'vous', 'ils', 'elles', 'le', 'la', 'les',
+    'un', 'une', 'des', 'du', 'de', 'et', 'ou', 'mais', 'avec', 'sans',
+    # Business specific
+    'heures', 'ouvert', 'fermé', 'prix', 'coût', 'rendez-vous',
+    'coupe', 'cheveux', 'salon', 'adresse', 'téléphone',
+    # Action words
+    'j\'aimerais', 'j\'ai', 'besoin', 'pouvez-vous', 'êtes-vous',
+    'voudrais', 'cherche', 'veux', 'avoir', 'être'
+])
+
+# Service names picked out of booking requests
+_SERVICE_WORDS = frozenset(_fold(word) for word in [
+    'haircut', 'massage', 'facial', 'manicure', 'pedicure',
+    'coupe', 'cheveux', 'manucure', 'pédicure'
+])
+
+class _Prepared(NamedTuple):
+    """A message lowercased, accent-folded, tokenized and keyword-scanned once,
+    shared by every helper (text keeps the original for prompts)"""
+    text: str
+    text_lower: str
+    tokens: List[str]
+    token_set: FrozenSet[str]
+    keyword_hits: Dict[str, List[Tuple[str, int]]]
+
+def _prepare(message: str, keyword_ac: ahocorasick.Automaton) -> _Prepared:
+    """Derive the per-message text forms the classifiers need"""
+    text_lower = _fold(message.lower())
+    tokens = _WORD_RE.findall(text_lower)
+    return _Prepared(message, text_lower, tokens, frozenset(tokens), _matched_words(keyword_ac, text_lower))
+
+def _build_automaton(groups: Dict[str, Tuple[str, ...]]) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton over every word in groups; each word's value lists
+    the (group, index) positions it holds, so duplicate entries still count"""
+    positions: Dict[str, List[Tuple[str, int]]] = {}
+    for group, words in groups.items():
+        for idx, word in enumerate(words):
+            positions.setdefault(word, []).append((group, idx))
+    automaton = ahocorasick.Automaton()
+    for word, entries in positions.items():
+        automaton.add_word(word, (word, entries))
+    automaton.make_automaton()
+    return automaton
+
+def _matched_words(automaton: ahocorasick.Automaton, text: str) -> Dict[str, List[Tuple[str, int]]]:
+    """Distinct words of the automaton occurring in text (one pass over text)"""
+    return {word: entries for _, (word, entries) in automaton.iter(text)}
+
+# Prompt templates. Static instructions and business context come first and the
+# customer's {message} last, so each business's prompts render once into a fixed
+# head and tail (see _build_ctx) and a request only concatenates the message in
+_PROMPT_TEMPLATES = {
+    ('french', 'classify'): """
+Classifiez un message client pour un {type}.
+
+Contexte du commerce:
+- Type: {type}
+- Services: {services}
+- Heures: {hours}
+
+Classifiez l'intention comme une de:
+1. booking - veut prendre/réserver un rendez-vous ou service
+2. faq - demande sur heures, prix, lieu, services, politiques
+3. complaint - exprime insatisfaction, veut remboursement, escalade
+4. cancellation - veut annuler ou reporter un rendez-vous existant
+5. general - conversation casual, remerciements, ou intention peu claire
+
+Format de réponse (JSON):
+{{
+    "intent": "booking|faq|complaint|cancellation|general",
+    "confidence": 0.0-1.0,
+    "reason": "explication brève",
+    "escalate": true/false
+}}
+
+Message: "{message}"
+""",
+    ('english', 'classify'): """
+Classify a customer message for a {type}.
+
+Business context:
+- Type: {type}
+- Services: {services}
+- Hours: {hours}
+
+Classify the intent as one of:
+1. booking - wants to schedule/book an appointment or service
+2. faq - asking about hours, pricing, location, services, policies
+3. complaint - expressing dissatisfaction, wants refund, escalation
+4. cancellation - wants to cancel or reschedule existing booking
+5. general - casual conversation, thanks, or unclear intent
+
+Response format (JSON):
+{{
+    "intent": "booking|faq|complaint|cancellation|general",
+    "confidence": 0.0-1.0,
+    "reason": "brief explanation",
+    "escalate": true/false
+}}
+
+Message: "{message}"
+""",
+    ('french', 'classify_batch'): """
+Classifiez chacun des messages client ci-dessous pour un {type}.
+
+Contexte du commerce:
+- Type: {type}
+- Services: {services}
+- Heures: {hours}
+
+Intentions possibles:
+1. booking - veut prendre/réserver un rendez-vous ou service
+2. faq - demande sur heures, prix, lieu, services, politiques
+3. complaint - exprime insatisfaction, veut remboursement, escalade
+4. cancellation - veut annuler ou reporter un rendez-vous existant
+5. general - conversation casual, remerciements, ou intention peu claire
+
+Format de réponse: un tableau JSON, un objet par message, dans le même ordre:
+[
+    {{"intent": "booking|faq|complaint|cancellation|general", "confidence": 0.0-1.0, "escalate": true/false}}
+]
+
+Messages:
+{message}
+""",
+    ('english', 'classify_batch'): """
+Classify each of the customer messages below for a {type}.
+
+Business context:
+- Type: {type}
+- Services: {services}
+- Hours: {hours}
+
+Possible intents:
+1. booking - wants to schedule/book an appointment or service
+2. faq - asking about hours, pricing, location, services, policies
+3. complaint - expressing dissatisfaction, wants refund, escalation
+4. cancellation - wants to cancel or reschedule existing booking
+5. general - casual conversation, thanks, or unclear intent
+
+Response format: a JSON array with one object per message, in the same order:
+[
+    {{"intent": "booking|faq|complaint|cancellation|general", "confidence": 0.0-1.0, "escalate": true/false}}
+]
+
+Messages:
+{message}
+""",
+    ('french', 'booking'): """
+Répondre en français à un client qui veut prendre rendez-vous.
+
+Salon: {name}
+Services: {services}
+Heures: {hours}
+
+Instructions:
+- Répondre en français seulement
+- Être amical et professionnel
+- Si service et heure mentionnés, confirmer
+- Sinon demander quel service et quel moment
+- Garder sous 160 caractères pour SMS
+
+Client: "{message}"
+
+Réponse:
+""",
+    ('french', 'faq_hours'): """
+Répondre à une question sur les heures d'ouverture.
+
+Heures: {hours}
+
+Répondre en français, être clair et utile.
+Garder sous 160 caractères.
+
+Question: "{message}"
+""",
+    ('french', 'faq_pricing'): """
+Répondre à une question sur les prix.
+
+Services et prix: Coupe 45$-65$, Coloration 85$-150$, Coiffage 35$-50$
+
+Répondre en français, donner les prix pertinents.
+Garder sous 160 caractères.
+
+Question: "{message}"
+""",
+    ('french', 'faq_location'): """
+Répondre à une question sur l'adresse.
+
+Adresse: {address}
+
+Répondre en français avec l'adresse et info de stationnement.
+Garder sous 160 caractères.
+
+Question: "{message}"
+""",
+    ('french', 'faq'): """
+Répondre à une question en français.
+
+Salon: {name}
+Adresse: {address}
+Heures: {hours}
+
+Être utile et professionnel en français.
+Garder sous 160 caractères.
+
+Question: "{message}"
+""",
+    ('french', 'complaint'): """
+Répondre avec empathie à une plainte en français.
+
+Salon: {name}
+
+Instructions:
+- Répondre en français seulement
+- Être empathique et professionnel
+- S'excuser appropriément
+- Offrir contact direct pour résoudre
+- Garder sous 160 caractères
+
+Message: "{message}"
+
+Réponse:
+""",
+    ('french', 'general'): """
+Répondre à un message client en français.
+
+Salon: {name}
+
+Instructions:
+- Répondre en français seulement
+- Être amical et professionnel
+- Demander comment aider
+- Garder sous 160 caractères
+
+Message: "{message}"
+
+Réponse:
+""",
+    ('english', 'booking'): """
+Generate a helpful booking response for a customer message.
+
+Business: {name}
+Type: {type}
+Services: {services}
+Hours: {hours}
+
+Guidelines:
+- Be friendly and professional
+- If they specified a service and time, acknowledge it
+- If they're vague, ask for specific service and preferred time
+- Mention our services if they didn't specify
+- Keep response under 160 characters for SMS
+- Include a call-to-action
+
+Customer: "{message}"
+
+Response:
+""",
+    ('english', 'faq'): """
+Answer a customer question about our business.
+
+Business Information:
+Business: {name}
+Type: {type}
+Address: {address}
+Hours: {hours}
+Services: {services}
+
+Guidelines:
+- Answer directly and helpfully
+- Use the exact information provided
+- If info not available, say "Please call us for details"
+- Be friendly but concise
+- Keep under 160 characters
+
+Question: "{message}"
+
+Response:
+""",
+    ('english', 'complaint'): """
+Respond empathetically to a customer complaint.
+
+Business: {name}
+
+Guidelines:
+- Acknowledge their concern genuinely
+- Apologize appropriately
+- Explain next steps clearly
+- Offer direct contact
+- Professional but warm tone
+- Keep under 160 characters
+
+Customer: "{message}"
+
+Response:
+""",
+    ('english', 'general'): """
+Respond professionally to a customer message.
+
+Business: {name}
+
+Guidelines:
+- Be friendly and helpful
+- Try to understand what they might need
+- Offer relevant services if appropriate
+- Ask clarifying questions if unclear
+- Keep response brief and engaging
+- Keep under 160 characters
+
+Customer: "{message}"
+
+Response:
+""",
+}
+
+# Business fields (and their defaults) each prompt reads; mirrors business.get(field, default)
+_PROMPT_DEFAULTS = {
+    ('french', 'classify'): {'type': 'salon de coiffure', 'hours': "Heures d'affaires standard"},
+    ('english', 'classify'): {'type': 'local business', 'hours': 'Standard business hours'},
+    ('french', 'classify_batch'): {'type': 'salon de coiffure', 'hours': "Heures d'affaires standard"},
+    ('english', 'classify_batch'): {'type': 'local business', 'hours': 'Standard business hours'},
+    ('french', 'booking'): {'name': 'Salon de Coiffure', 'hours': 'Lun-Ven 9h-18h'},
+    ('french', 'faq_hours'): {'hours': 'Lun-Sam 9h-19h, Fermé Dimanche'},
+    ('french', 'faq_pricing'): {},
+    ('french', 'faq_location'): {'address': '123 rue Principale'},
+    ('french', 'faq'): {},
+    ('french', 'complaint'): {},
+    ('french', 'general'): {},
+    ('english', 'booking'): {'name': 'Local Business', 'type': 'service business', 'hours': 'Mon-Fri 9am-6pm'},
+    ('english', 'faq'): {'name': 'Local Business', 'type': 'service business',
+                         'address': 'Contact us for location', 'hours': 'Standard business hours'},
+    ('english', 'complaint'): {},
+    ('english', 'general'): {'name': 'Local Business'},
+}
+
+# Canned replies per language: when Gemini returns nothing, and when building the reply fails
+_FALLBACK_REPLIES = {
+    'french': "Merci de nous contacter! Comment puis-je vous aider aujourd'hui?",
+    'english': "Thanks for reaching out! How can I help you today?",
+}
+_ERROR_REPLIES = {
+    'french': "Merci de votre message! Quelqu'un de notre équipe vous contactera bientôt.",
+    'english': "Thanks for your message! Someone from our team will get back to you shortly.",
+}
+
+_PROMPT_FIELDS = ('name', 'type', 'hours', 'address', 'services')
+_MESSAGE_SLOT = '\x00'
+
+# Intent names, interned so comparisons against them are pointer checks
+INTENTS = tuple(sys.intern(intent) for intent in ('booking', 'faq', 'complaint', 'cancellation', 'general'))
+_INTENTS = frozenset(INTENTS)
+
+def _parse_classification(text: str) -> Optional[Dict[str, Any]]:
+    """Parse Gemini's classification JSON, tolerating ```json fences or prose
+    around the object; None if it isn't a usable classification"""
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end < start:
+        return None
+    result = orjson.loads(text[start:end + 1])
+    if not isinstance(result, dict) or result.get('intent') not in _INTENTS:
+        return None
+    return result
+
+def _parse_batch_classification(text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """Parse a batched classification reply into count results, None for any
+    entry that is missing or unusable"""
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    start, end = text.find('['), text.rfind(']')
+    if start < 0 or end < start:
+        return results
+    parsed = orjson.loads(text[start:end + 1])
+    if not isinstance(parsed, list):
+        return results
+    for i, result in enumerate(parsed[:count]):
+        if isinstance(result, dict) and result.get('intent') in _INTENTS and 'confidence' in result:
+            results[i] = result
+    return results
+
+def _business_key(business: Dict) -> Tuple:
+    """Hashable snapshot of the business fields the prompts use (absent keys left out)"""
+    return tuple(
+        (field, tuple(business[field]) if isinstance(business[field], list) else business[field])
+        for field in _PROMPT_FIELDS if field in business
+    )
+
+@dataclass(slots=True, frozen=True, eq=False)
+class _BizCtx:
+    """A business's prompt context, resolved once per business: its id and
+    every prompt pre-rendered around the customer-message slot"""
+    id: Any
+    prompts: Dict[Tuple[str, str], Tuple[str, str]]
+
+def _build_ctx(business_id: Any, key: Tuple) -> _BizCtx:
+    """Render every prompt for a business, split into the text before and
+    after the customer message"""
+    business = dict(key)
+    services = ', '.join(business.get('services') or [])
+    prompts = {}
+    for name, template in _PROMPT_TEMPLATES.items():
+        values = {field: business.get(field, default) for field, default in _PROMPT_DEFAULTS[name].items()}
+        values.setdefault('services', services)
+        for field in ('name', 'type', 'hours', 'address'):
+            values.setdefault(field, business.get(field))
+        values['message'] = _MESSAGE_SLOT
+        head, tail = template.format_map(values).split(_MESSAGE_SLOT)
+        prompts[name] = (head, tail)
+    return _BizCtx(business_id, prompts)
+
+_cached_ctx = functools.lru_cache(maxsize=256)(_build_ctx)
+
+def _get_ctx(business: Dict) -> _BizCtx:
+    """Prompt context for a business record, shared by every business with the same fields"""
+    business_id, key = business.get('id'), _business_key(business)
+    try:
+        return _cached_ctx(business_id, key)
+    except TypeError:
+        # Unhashable field values (not produced by Database): render without caching
+        return _build_ctx(business_id, key)
+
+def _render_prompt(ctx: _BizCtx, name: Tuple[str, str], message: str) -> str:
+    """Prompt name for a business around message: one lookup plus one concat"""
+    head, tail = ctx.prompts[name]
+    return head + message + tail
+
+@dataclass(slots=True, frozen=True)
 class MessageIntent:
     """Represents classified message intent"""
     intent: str  # 'booking', 'faq', 'complaint', 'general'
@@ -26,7 +563,7 @@ class MessageIntent:
     entities: Dict[str, Any]
     requires_escalation: bool = False
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AIResponse:
     """Represents AI-generated response"""
     text: str
@@ -35,16 +572,68 @@ class AIResponse:
     escalate: bool = False
     booking_info: Optional[Dict] = None
 
+def _load_langid_model():
+    """Load the fastText language-ID model, or None if it isn't available"""
+    if fasttext is None or not os.path.exists(LANGID_MODEL_PATH):
+        return None
+    try:
+        model = fasttext.load_model(LANGID_MODEL_PATH)
+        logger.info("Language ID model loaded: %s", LANGID_MODEL_PATH)
+        return model
+    except Exception as e:
+        logger.error("Failed to load language ID model: %s", e)
+        return None
+
 class AIProcessor:
     """Main AI processing engine with bilingual support"""
     
+    # Booking time/date references in priority order. Each kind is scanned on
+    # its own: in one alternation an earlier match would consume text a later
+    # kind needs ("10/12h" must still find the clock time "12h")
+    _TIME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+        r"(\d{1,2}):?(\d{2})?\s*(am|pm|h)",
+        r"(tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday)",
+        r"(demain|aujourd'hui|lundi|mardi|mercredi|jeudi|vendredi|samedi|dimanche)",
+        r"(next week|this week|semaine prochaine|cette semaine)",
+        r"(\d{1,2})/(\d{1,2})",
+    ))
+    
+    # Group tag of the escalation triggers inside the shared keyword automaton
+    _ESCALATION = 'escalation'
+    
+    # FAQ question topics; a zero-width lookahead tests every position, so
+    # this matches exactly where a plain substring check would
+    _FAQ_TOPIC_RE = re.compile(_fold(
+        r"(?=(?P<hours>hour|open|close|heure|ouvert|fermé)"
+        r"|(?P<pricing>price|cost|much|prix|coût|combien)"
+        r"|(?P<location>location|address|where|adresse|où))"
+    ))
+    
     def __init__(self):
         self.setup_gemini()
         self.intent_keywords = self._load_intent_keywords()
         self.escalation_triggers = self._load_escalation_triggers()
         
+        # Intent keywords and escalation triggers share one automaton, so a
+        # single pass over the message finds both (tagged by group)
+        self._keyword_ac = _build_automaton({**self.intent_keywords, self._ESCALATION: self.escalation_triggers})
+        self._escalation_words = frozenset(self.escalation_triggers)
+        self._intent_len = {intent: len(words) for intent, words in self.intent_keywords.items()}
+        self._lid = _load_langid_model()
+        
+        # (business_id, intent, language, normalized message) -> Gemini reply text
+        self._response_cache: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        
+        # Classification batcher, started on first use inside the running loop
+        self._cls_queue: Optional[asyncio.Queue] = None
+        self._cls_worker: Optional[asyncio.Task] = None
+        self._cls_tasks = set()
+        
     def setup_gemini(self):
         """Initialize Google Gemini API with correct model name"""
+        if getattr(self, 'model', None) is not None:
+            return
+        
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in environment")
@@ -61,12 +650,26 @@ class AIProcessor:
                 self.model = genai.GenerativeModel('gemini-pro')
                 logger.info("Gemini AI initialized successfully with gemini-pro")
             except Exception as e2:
-                logger.error(f"Failed to initialize Gemini model: {str(e2)}")
+                logger.error("Failed to initialize Gemini model: %s", e2)
                 raise e2
     
-    def _load_intent_keywords(self) -> Dict[str, List[str]]:
+    async def warmup(self):
+        """Make a one-token Gemini call to open (or keep open) the API connection"""
+        try:
+            await self.model.generate_content_async("ok", generation_config=_WARMUP_GENERATION_CONFIG)
+        except Exception as e:
+            logger.warning("Gemini warmup failed: %s", e)
+    
+    async def keep_warm(self):
+        """Warm the connection now, then every GEMINI_KEEPALIVE_SECONDS (run as a background task)"""
+        await self.warmup()
+        while GEMINI_KEEPALIVE_SECONDS > 0:
+            await asyncio.sleep(GEMINI_KEEPALIVE_SECONDS)
+            await self.warmup()
+    
+    def _load_intent_keywords(self) -> Dict[str, Tuple[str, ...]]:
         """Load keyword patterns for intent classification (bilingual)"""
-        return {
+        raw = {
             'booking': [
                 # English
                 'appointment', 'book', 'schedule', 'reserve', 'available',
@@ -104,10 +707,12 @@ class AIProcessor:
                 'annuler', 'reporter', 'changer', 'déplacer', 'autre heure'
             ]
         }
+        # Immutable, interned, accent-folded tables: safe to share and cheap to compare
+        return {sys.intern(intent): tuple(sys.intern(_fold(word)) for word in words) for intent, words in raw.items()}
     
-    def _load_escalation_triggers(self) -> List[str]:
+    def _load_escalation_triggers(self) -> Tuple[str, ...]:
         """Load patterns that should trigger human escalation (bilingual)"""
-        return [
+        return tuple(sys.intern(_fold(word)) for word in [
             # English
             'manager', 'supervisor', 'owner', 'complaint', 'legal',
             'lawsuit', 'attorney', 'refund', 'money back',
@@ -116,162 +721,235 @@ class AIProcessor:
             'gérant', 'superviseur', 'propriétaire', 'plainte', 'légal',
             'poursuites', 'avocat', 'remboursement', 'argent',
             'terrible', 'affreux', 'pire', 'horrible', 'dégoûtant'
-        ]
+        ])
     
-    def detect_language(self, message: str) -> str:
+    def detect_language(self, message: str, prep: Optional[_Prepared] = None) -> str:
         """Detect if message is in French or English"""
-        message_lower = message.lower()
+        prep = prep or _prepare(message, self._keyword_ac)
         
-        # French indicators (more comprehensive)
-        french_words = [
-            # Greetings & politeness
-            'bonjour', 'bonsoir', 'salut', 'merci', 'svp', 's\'il vous plaît',
-            # Questions words
-            'comment', 'quand', 'où', 'pourquoi', 'combien', 'quel', 'quelle',
-            # Common words
-            'oui', 'non', 'je', 'nous', 'vous', 'ils', 'elles', 'le', 'la', 'les',
-            'un', 'une', 'des', 'du', 'de', 'et', 'ou', 'mais', 'avec', 'sans',
-            # Business specific
-            'heures', 'ouvert', 'fermé', 'prix', 'coût', 'rendez-vous',
-            'coupe', 'cheveux', 'salon', 'adresse', 'téléphone',
-            # Action words
-            'j\'aimerais', 'j\'ai besoin', 'pouvez-vous', 'êtes-vous',
-            'voudrais', 'cherche', 'veux', 'avoir', 'être'
-        ]
+        if self._lid is not None and not (message.isascii() and len(message) < LANGID_MIN_CHARS):
+            try:
+                labels, _ = self._lid.predict(message.replace('\n', ' '), k=1)
+                return 'french' if labels[0] == '__label__fr' else 'english'
+            except Exception as e:
+                logger.error("Language ID error: %s", e)
         
-        # Count French words
-        french_count = sum(1 for word in french_words if word in message_lower)
+        # Count French words (distinct indicators present)
+        french_count = len(_FRENCH_WORDS & prep.token_set)
         
         # If 2+ French words, respond in French
         return 'french' if french_count >= 2 else 'english'
     
-    async def classify_intent(self, message: str, business: Dict) -> MessageIntent:
-        """Classify customer message intent using hybrid approach (bilingual)"""
-        message_lower = message.lower()
+    def _keyword_classify(self, prep: _Prepared) -> Tuple[Optional[MessageIntent], str]:
+        """Keyword-based classification: the intent when the match is clear
+        (else None), plus a keyword guess worth drafting a reply for: the only
+        intent with any keyword hits ('general' when none or several matched)"""
+        # Quick keyword-based classification: one automaton pass, then count
+        # each matched keyword once per list position it holds
+        hits = Counter()
+        for entries in prep.keyword_hits.values():
+            for intent, _ in entries:
+                if intent != self._ESCALATION:
+                    hits[intent] += 1
+        
+        # Best normalized score, scanning intents in intent_keywords order so
+        # ties go to the earlier intent (as max() over that table did), not to
+        # whichever keyword appears first in the message
+        top_intent, top_score = None, 0.0
+        for intent, length in self._intent_len.items():
+            score = hits.get(intent, 0) / length
+            if score > top_score:
+                top_intent, top_score = intent, score
         
-        # Quick keyword-based classification
-        keyword_scores = {}
-        for intent, keywords in self.intent_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in message_lower)
-            if score > 0:
-                keyword_scores[intent] = score / len(keywords)
+        if top_intent is None:
+            return None, 'general'
         
         # If clear keyword match, use it
-        if keyword_scores:
-            top_intent = max(keyword_scores.keys(), key=lambda k: keyword_scores[k])
-            if keyword_scores[top_intent] > 0.2:  # Lower threshold for bilingual
-                return MessageIntent(
-                    intent=top_intent,
-                    confidence=min(keyword_scores[top_intent] * 2, 1.0),
-                    entities=self._extract_entities(message, top_intent),
-                    requires_escalation=self._check_escalation_needed(message)
-                )
+        if top_score > 0.2:  # Lower threshold for bilingual
+            return MessageIntent(
+                intent=top_intent,
+                confidence=min(top_score * 2, 1.0),
+                entities=self._extract_entities(prep, top_intent),
+                requires_escalation=self._check_escalation_needed(prep)
+            ), top_intent
+        return None, top_intent if len(hits) == 1 else 'general'
+    
+    async def classify_intent(self, message: str, business: Dict, prep: Optional[_Prepared] = None) -> MessageIntent:
+        """Classify customer message intent using hybrid approach (bilingual)"""
+        prep = prep or _prepare(message, self._keyword_ac)
+        keyword_intent, _ = self._keyword_classify(prep)
+        if keyword_intent:
+            return keyword_intent
         
         # Use AI for ambiguous cases
-        ai_classification = await self._ai_classify_intent(message, business)
+        ai_classification = await self._classify_with_ai(prep, _get_ctx(business), self.detect_language(message, prep))
         return ai_classification
     
-    async def _ai_classify_intent(self, message: str, business: Dict) -> MessageIntent:
+    async def _ai_classify_intent(self, prep: _Prepared, ctx: _BizCtx, language: Optional[str] = None) -> MessageIntent:
         """Use Gemini AI for intent classification (bilingual)"""
+        message = prep.text
         try:
-            # Detect language for appropriate prompt
-            language = self.detect_language(message)
+            # Detect language for appropriate prompt (unless the caller already did)
+            language = language or self.detect_language(message, prep)
             
-            # Build variables safely outside f-strings
-            business_type = business.get('type', 'salon de coiffure')
-            services_list = ', '.join(business.get('services', []))
-            business_hours = business.get('hours', "Heures d'affaires standard")
+            prompt = _render_prompt(ctx, (language, 'classify'), message)
             
-            if language == 'french':
-                prompt = f"""
-                Classifiez ce message client pour un {business_type}:
-                
-                Message: "{message}"
-                
-                Contexte du commerce:
-                - Type: {business_type}
-                - Services: {services_list}
-                - Heures: {business_hours}
-                
-                Classifiez l'intention comme une de:
-                1. booking - veut prendre/réserver un rendez-vous ou service
-                2. faq - demande sur heures, prix, lieu, services, politiques
-                3. complaint - exprime insatisfaction, veut remboursement, escalade
-                4. cancellation - veut annuler ou reporter un rendez-vous existant
-                5. general - conversation casual, remerciements, ou intention peu claire
-                
-                Format de réponse (JSON):
-                {{
-                    "intent": "booking|faq|complaint|cancellation|general",
-                    "confidence": 0.0-1.0,
-                    "reason": "explication brève",
-                    "escalate": true/false
-                }}
-                """
+            response_text = await self._safe_generate_content(prompt)
+            result = _parse_classification(response_text) if response_text else None
+            if result:
+                return self._intent_from_result(prep, result)
             else:
-                # Build English variables safely
-                business_type_en = business.get('type', 'local business')
-                business_hours_en = business.get('hours', 'Standard business hours')
-                
-                prompt = f"""
-                Classify this customer message for a {business_type_en}:
+                return self._fallback_intent_classification(prep)
                 
-                Message: "{message}"
-                
-                Business context:
-                - Type: {business_type_en}
-                - Services: {services_list}
-                - Hours: {business_hours_en}
-                
-                Classify the intent as one of:
-                1. booking - wants to schedule/book an appointment or service
-                2. faq - asking about hours, pricing, location, services, policies
-                3. complaint - expressing dissatisfaction, wants refund, escalation
-                4. cancellation - wants to cancel or reschedule existing booking
-                5. general - casual conversation, thanks, or unclear intent
-                
-                Response format (JSON):
-                {{
-                    "intent": "booking|faq|complaint|cancellation|general",
-                    "confidence": 0.0-1.0,
-                    "reason": "brief explanation",
-                    "escalate": true/false
-                }}
-                """
+        except Exception as e:
+            logger.error("AI classification error: %s", e)
+            return self._fallback_intent_classification(prep)
+        
+    
+    def _intent_from_result(self, prep: _Prepared, result: Dict[str, Any]) -> MessageIntent:
+        """MessageIntent from one parsed Gemini classification"""
+        intent = sys.intern(result['intent'])
+        return MessageIntent(
+            intent=intent,
+            confidence=result['confidence'],
+            entities=self._extract_entities(prep, intent),
+            requires_escalation=result.get('escalate', False)
+        )
+    
+    async def _classify_with_ai(self, prep: _Prepared, ctx: _BizCtx, language: str) -> MessageIntent:
+        """Gemini classification, coalesced with concurrent messages when batching is on"""
+        if CLASSIFY_BATCH_SIZE <= 1:
+            return await self._ai_classify_intent(prep, ctx, language)
+        
+        if self._cls_worker is None:
+            self._cls_queue = asyncio.Queue()
+            self._cls_worker = asyncio.create_task(self._classify_batch_worker())
+        future = asyncio.get_running_loop().create_future()
+        self._cls_queue.put_nowait((prep, ctx, language, future))
+        return await future
+    
+    async def _classify_batch_worker(self):
+        """Collect queued classifications for up to CLASSIFY_FLUSH_SECONDS (or
+        CLASSIFY_BATCH_SIZE items), then classify each business/language group"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._cls_queue.get()]
+            deadline = loop.time() + CLASSIFY_FLUSH_SECONDS
+            while len(batch) < CLASSIFY_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._cls_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
             
-            response_text = await self._safe_generate_content(prompt)
-            if response_text:
-                result = json.loads(response_text.strip())
-                
-                return MessageIntent(
-                    intent=result['intent'],
-                    confidence=result['confidence'],
-                    entities=self._extract_entities(message, result['intent']),
-                    requires_escalation=result.get('escalate', False)
+            # One prompt per business context and language
+            groups: Dict[Tuple, List[Tuple]] = {}
+            for item in batch:
+                _, ctx, language, _ = item
+                groups.setdefault((ctx, language), []).append(item)
+            for items in groups.values():
+                task = asyncio.create_task(self._classify_group(items))
+                self._cls_tasks.add(task)
+                task.add_done_callback(self._cls_tasks.discard)
+    
+    async def _classify_group(self, items: List[Tuple]):
+        """Classify messages sharing a business and language in one Gemini call;
+        anything the batch reply doesn't cover is classified on its own"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        try:
+            if len(items) > 1:
+                _, ctx, language, _ = items[0]
+                numbered = '\n'.join(f'{i}. "{prep.text}"' for i, (prep, _, _, _) in enumerate(items, 1))
+                response_text = await self._safe_generate_content(
+                    _render_prompt(ctx, (language, 'classify_batch'), numbered)
                 )
-            else:
-                return self._fallback_intent_classification(message)
-                
+                if response_text:
+                    results = _parse_batch_classification(response_text, len(items))
         except Exception as e:
-            logger.error(f"AI classification error: {str(e)}")
-            return self._fallback_intent_classification(message)
+            logger.error("Batch classification error: %s", e)
         
+        for (prep, ctx, language, future), result in zip(items, results):
+            if future.done():
+                continue
+            if result:
+                intent = self._intent_from_result(prep, result)
+            else:
+                intent = await self._ai_classify_intent(prep, ctx, language)
+            # The waiting caller may have been cancelled meanwhile
+            if not future.done():
+                future.set_result(intent)
+    
+    async def _call_gemini(self, call):
+        """Await call() under the concurrency cap and rate limiter, backing off
+        and retrying when Gemini still answers 429 (quota exhausted)"""
+        async with _AI_SEM:
+            for attempt in range(GEMINI_MAX_RETRIES + 1):
+                if _RATE_LIMITER:
+                    await _RATE_LIMITER.acquire()
+                try:
+                    return await call()
+                except ResourceExhausted:
+                    if attempt == GEMINI_MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(GEMINI_BACKOFF_SECONDS * 2 ** attempt)
     
     async def _safe_generate_content(self, prompt: str) -> Optional[str]:
         """Safely generate content with error handling"""
-        try:
-            response = self.model.generate_content(prompt)
+        async def generate():
+            # Native async call: waiting on Gemini never holds the loop or a thread
+            response = await self.model.generate_content_async(prompt)
             return response.text
+        
+        try:
+            return await self._call_gemini(generate)
         except Exception as e:
-            logger.error(f"Gemini API error: {str(e)}")
+            logger.error("Gemini API error: %s", e)
             return None
     
-    def _fallback_intent_classification(self, message: str) -> MessageIntent:
+    async def _safe_stream_reply(self, prompt: str, max_chars: int = SMS_REPLY_CHARS) -> Optional[str]:
+        """Stream an SMS reply, stop once max_chars have arrived and trim it to fit"""
+        async def stream():
+            response = await self.model.generate_content_async(
+                prompt, generation_config=_REPLY_GENERATION_CONFIG, stream=True
+            )
+            text = ''
+            async for chunk in response:
+                text += chunk.text
+                # Anything past the budget would be trimmed off anyway
+                if len(text) > max_chars:
+                    break
+            return _trim_reply(text, max_chars)
+        
+        try:
+            return await self._call_gemini(stream) or None
+        except Exception as e:
+            logger.error("Gemini API error: %s", e)
+            return None
+    
+    async def _cached_reply(self, prompt: str, prep: _Prepared, ctx: _BizCtx, intent: str, language: str,
+                            use_cache: bool = True) -> Optional[str]:
+        """Reply text for prompt, served from the response cache when the same
+        business already got the same (normalized) message for this intent
+        (use_cache=False always asks Gemini, then refreshes the entry)"""
+        key = (ctx.id, intent, language, ' '.join(prep.text_lower.split()))
+        cached = self._response_cache.get(key) if use_cache else None
+        if cached is not None:
+            return cached
+        
+        response_text = await self._safe_stream_reply(prompt)
+        # Only real Gemini replies are cached; failures fall through to the canned text
+        if response_text:
+            self._response_cache[key] = response_text
+        return response_text
+    
+    def _fallback_intent_classification(self, prep: _Prepared) -> MessageIntent:
         """Fallback intent classification when AI fails (bilingual)"""
-        message_lower = message.lower()
+        message_lower = prep.text_lower
         
-        # Bilingual keyword-based fallback
-        if any(word in message_lower for word in ['book', 'appointment', 'schedule', 'rendez-vous', 'réserver']):
+        # Bilingual keyword-based fallback (message_lower is accent-folded)
+        if any(word in message_lower for word in ['book', 'appointment', 'schedule', 'rendez-vous', 'reserver']):
             intent = 'booking'
         elif any(word in message_lower for word in ['hours', 'open', 'price', 'cost', 'heures', 'ouvert', 'prix']):
             intent = 'faq'
@@ -284,278 +962,109 @@ class AIProcessor:
             intent=intent,
             confidence=0.6,
             entities={},
-            requires_escalation=self._check_escalation_needed(message)
+            requires_escalation=self._check_escalation_needed(prep)
         )
     
-    def _extract_entities(self, message: str, intent: str) -> Dict[str, Any]:
+    def _extract_entities(self, prep: _Prepared, intent: str) -> Dict[str, Any]:
         """Extract relevant entities based on intent (bilingual)"""
         entities = {}
+        message_lower = prep.text_lower
         
         if intent == 'booking':
-            # Extract time/date references (bilingual)
-            time_patterns = [
-                r'(\d{1,2}):?(\d{2})?\s*(am|pm|h)',
-                r'(tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
-                r'(demain|aujourd\'hui|lundi|mardi|mercredi|jeudi|vendredi|samedi|dimanche)',
-                r'(next week|this week|semaine prochaine|cette semaine)',
-                r'(\d{1,2})/(\d{1,2})'
-            ]
-            
-            for pattern in time_patterns:
-                matches = re.findall(pattern, message.lower())
+            # Extract time/date references (bilingual): the first kind that matches wins
+            for pattern in self._TIME_PATTERNS:
+                matches = pattern.findall(message_lower)
                 if matches:
                     entities['time_references'] = matches
                     break
                     
             # Extract service mentions (bilingual)
-            services = ['haircut', 'massage', 'facial', 'manicure', 'pedicure',
-                       'coupe', 'cheveux', 'massage', 'facial', 'manucure', 'pédicure']
-            entities['services'] = [word for word in message.lower().split() if word in services]
+            entities['services'] = [word for word in prep.tokens if word in _SERVICE_WORDS]
         
         elif intent == 'faq':
-            # Extract question type (bilingual)
-            if any(word in message.lower() for word in ['hour', 'open', 'close', 'heure', 'ouvert', 'fermé']):
-                entities['question_type'] = 'hours'
-            elif any(word in message.lower() for word in ['price', 'cost', 'much', 'prix', 'coût', 'combien']):
-                entities['question_type'] = 'pricing'
-            elif any(word in message.lower() for word in ['location', 'address', 'where', 'adresse', 'où']):
-                entities['question_type'] = 'location'
+            # Extract question type (bilingual); alternatives are listed in
+            # priority order, so the first topic seen at a position is the best one there
+            topics = {match.lastgroup for match in self._FAQ_TOPIC_RE.finditer(message_lower)}
+            for topic in ('hours', 'pricing', 'location'):
+                if topic in topics:
+                    entities['question_type'] = topic
+                    break
         
         return entities
     
-    def _check_escalation_needed(self, message: str) -> bool:
+    def _check_escalation_needed(self, prep: _Prepared) -> bool:
         """Check if message needs human escalation (bilingual)"""
-        message_lower = message.lower()
-        return any(trigger in message_lower for trigger in self.escalation_triggers)
+        return not self._escalation_words.isdisjoint(prep.keyword_hits)
     
-    async def generate_response(self, message: str, business: Dict, conversation: Dict = None) -> AIResponse:
-        """Generate response with bilingual support"""
+    async def generate_response(self, message: str, business: Dict, conversation: Dict = None,
+                                use_cache: bool = True) -> AIResponse:
+        """Generate response with bilingual support (use_cache=False bypasses the response cache)"""
+        
+        # Lowercase/tokenize once, and resolve the business prompt context once,
+        # for every helper below
+        prep = _prepare(message, self._keyword_ac)
+        ctx = _get_ctx(business)
         
         # Detect customer's language
-        language = self.detect_language(message)
+        language = self.detect_language(message, prep)
         
-        # Classify the message intent
-        intent_result = await self.classify_intent(message, business)
+        # Clear keyword match: no classification round-trip needed
+        keyword_intent, guess = self._keyword_classify(prep)
+        if keyword_intent:
+            return await self._generate_response(language, keyword_intent, prep, ctx, use_cache)
         
-        # Generate response based on language
-        if language == 'french':
-            return await self._generate_french_response(message, business, intent_result)
-        else:
-            return await self._generate_english_response(message, business, intent_result)
-    
-    async def _generate_french_response(self, message: str, business: Dict, intent: MessageIntent) -> AIResponse:
-        """Generate French responses"""
-        try:
-            if intent.intent == 'booking':
-                prompt = f"""
-                Répondre en français à ce client qui veut prendre rendez-vous:
-                
-                Client: "{message}"
-                
-                Salon: {business.get('name', 'Salon de Coiffure')}
-                Services: {', '.join(business.get('services', []))}
-                Heures: {business.get('hours', 'Lun-Ven 9h-18h')}
-                
-                Instructions:
-                - Répondre en français seulement
-                - Être amical et professionnel
-                - Si service et heure mentionnés, confirmer
-                - Sinon demander quel service et quel moment
-                - Garder sous 160 caractères pour SMS
-                
-                Réponse:
-                """
-            
-            elif intent.intent == 'faq':
-                if 'heure' in message.lower() or 'ouvert' in message.lower():
-                    prompt = f"""
-                    Répondre à cette question sur les heures d'ouverture:
-                    
-                    Question: "{message}"
-                    Heures: {business.get('hours', 'Lun-Sam 9h-19h, Fermé Dimanche')}
-                    
-                    Répondre en français, être clair et utile.
-                    Garder sous 160 caractères.
-                    """
-                
-                elif 'prix' in message.lower() or 'coût' in message.lower() or 'combien' in message.lower():
-                    prompt = f"""
-                    Répondre à cette question sur les prix:
-                    
-                    Question: "{message}"
-                    Services et prix: Coupe 45$-65$, Coloration 85$-150$, Coiffage 35$-50$
-                    
-                    Répondre en français, donner les prix pertinents.
-                    Garder sous 160 caractères.
-                    """
-                
-                elif 'adresse' in message.lower() or 'où' in message.lower():
-                    prompt = f"""
-                    Répondre à cette question sur l'adresse:
-                    
-                    Question: "{message}"
-                    Adresse: {business.get('address', '123 rue Principale')}
-                    
-                    Répondre en français avec l'adresse et info de stationnement.
-                    Garder sous 160 caractères.
-                    """
-                
-                else:
-                    prompt = f"""
-                    Répondre à cette question en français:
-                    
-                    Question: "{message}"
-                    Salon: {business.get('name')}
-                    Adresse: {business.get('address')}
-                    Heures: {business.get('hours')}
-                    
-                    Être utile et professionnel en français.
-                    Garder sous 160 caractères.
-                    """
-            
-            elif intent.intent == 'complaint':
-                prompt = f"""
-                Répondre avec empathie à cette plainte en français:
-                
-                Message: "{message}"
-                Salon: {business.get('name')}
-                
-                Instructions:
-                - Répondre en français seulement
-                - Être empathique et professionnel
-                - S'excuser appropriément
-                - Offrir contact direct pour résoudre
-                - Garder sous 160 caractères
-                
-                Réponse:
-                """
-            
-            else:
-                prompt = f"""
-                Répondre à ce message client en français:
-                
-                Message: "{message}"
-                Salon: {business.get('name')}
-                
-                Instructions:
-                - Répondre en français seulement
-                - Être amical et professionnel
-                - Demander comment aider
-                - Garder sous 160 caractères
-                
-                Réponse:
-                """
-            
-            response_text = await self._safe_generate_content(prompt)
-            if not response_text:
-                response_text = "Merci de nous contacter! Comment puis-je vous aider aujourd'hui?"
-            
-            return AIResponse(
-                text=response_text,
-                confidence=intent.confidence,
-                intent=intent.intent,
-                escalate=intent.requires_escalation or intent.intent == 'complaint'
-            )
-            
-        except Exception as e:
-            logger.error(f"French response error: {str(e)}")
+        # No single intent matched: a speculative draft would rarely be the
+        # right one, so classify first rather than spend a Gemini slot on it
+        if guess == 'general':
+            intent_result = await self._classify_with_ai(prep, ctx, language)
+            return await self._generate_response(language, intent_result, prep, ctx, use_cache)
+        
+        # One intent matched, weakly: ask Gemini for the intent while speculatively
+        # drafting the reply for the keyword guess, so the two round-trips overlap
+        draft_intent = MessageIntent(
+            intent=guess,
+            confidence=0.6,
+            entities=self._extract_entities(prep, guess),
+            requires_escalation=self._check_escalation_needed(prep)
+        )
+        intent_result, draft = await asyncio.gather(
+            self._classify_with_ai(prep, ctx, language),
+            self._generate_response(language, draft_intent, prep, ctx, use_cache)
+        )
+        
+        # Reply prompts depend only on the intent name, so a matching guess is reusable
+        if intent_result.intent == guess:
             return AIResponse(
-                text="Merci de votre message! Quelqu'un de notre équipe vous contactera bientôt.",
-                confidence=0.6,
-                intent=intent.intent
+                text=draft.text,
+                confidence=intent_result.confidence,
+                intent=intent_result.intent,
+                escalate=intent_result.requires_escalation or intent_result.intent == 'complaint'
             )
+        return await self._generate_response(language, intent_result, prep, ctx, use_cache)
     
-    async def _generate_english_response(self, message: str, business: Dict, intent: MessageIntent) -> AIResponse:
-        """Generate English responses (existing logic enhanced)"""
+    def _reply_kind(self, language: str, intent: str, message_lower: str) -> str:
+        """Reply prompt for an intent; French FAQs get a prompt per question topic"""
+        if language == 'french' and intent == 'faq':
+            # message_lower is accent-folded: 'cout' also matches "coût"
+            if 'heure' in message_lower or 'ouvert' in message_lower:
+                return 'faq_hours'
+            if 'prix' in message_lower or 'cout' in message_lower or 'combien' in message_lower:
+                return 'faq_pricing'
+            if 'adresse' in message_lower or 'où' in message_lower:
+                return 'faq_location'
+            return 'faq'
+        return intent if intent in ('booking', 'faq', 'complaint') else 'general'
+    
+    async def _generate_response(self, language: str, intent: MessageIntent, prep: _Prepared, ctx: _BizCtx,
+                                 use_cache: bool = True) -> AIResponse:
+        """Generate the reply for a classified message in the customer's language"""
         try:
-            if intent.intent == 'booking':
-                prompt = f"""
-                Generate a helpful booking response for this customer message:
-                
-                Customer: "{message}"
-                
-                Business: {business.get('name', 'Local Business')}
-                Type: {business.get('type', 'service business')}
-                Services: {', '.join(business.get('services', []))}
-                Hours: {business.get('hours', 'Mon-Fri 9am-6pm')}
-                
-                Guidelines:
-                - Be friendly and professional
-                - If they specified a service and time, acknowledge it
-                - If they're vague, ask for specific service and preferred time
-                - Mention our services if they didn't specify
-                - Keep response under 160 characters for SMS
-                - Include a call-to-action
-                
-                Response:
-                """
-            
-            elif intent.intent == 'faq':
-                faq_context = f"""
-                Business: {business.get('name', 'Local Business')}
-                Type: {business.get('type', 'service business')}
-                Address: {business.get('address', 'Contact us for location')}
-                Hours: {business.get('hours', 'Standard business hours')}
-                Services: {', '.join(business.get('services', []))}
-                """
-                
-                prompt = f"""
-                Answer this customer question about our business:
-                
-                Question: "{message}"
-                
-                Business Information:
-                {faq_context}
-                
-                Guidelines:
-                - Answer directly and helpfully
-                - Use the exact information provided
-                - If info not available, say "Please call us for details"
-                - Be friendly but concise
-                - Keep under 160 characters
-                
-                Response:
-                """
-            
-            elif intent.intent == 'complaint':
-                prompt = f"""
-                Respond empathetically to this customer complaint:
-                
-                Customer: "{message}"
-                Business: {business.get('name')}
-                
-                Guidelines:
-                - Acknowledge their concern genuinely
-                - Apologize appropriately 
-                - Explain next steps clearly
-                - Offer direct contact
-                - Professional but warm tone
-                - Keep under 160 characters
-                
-                Response:
-                """
-            
-            else:
-                prompt = f"""
-                Respond to this customer message professionally:
-                
-                Customer: "{message}"
-                Business: {business.get('name', 'Local Business')}
-                
-                Guidelines:
-                - Be friendly and helpful
-                - Try to understand what they might need
-                - Offer relevant services if appropriate
-                - Ask clarifying questions if unclear
-                - Keep response brief and engaging
-                - Keep under 160 characters
-                
-                Response:
-                """
+            kind = self._reply_kind(language, intent.intent, prep.text_lower)
+            prompt = _render_prompt(ctx, (language, kind), prep.text)
             
-            response_text = await self._safe_generate_content(prompt)
+            response_text = await self._cached_reply(prompt, prep, ctx, intent.intent, language, use_cache)
             if not response_text:
-                response_text = f"Thanks for reaching out! How can I help you today?"
+                response_text = _FALLBACK_REPLIES[language]
             
             return AIResponse(
                 text=response_text,
@@ -565,9 +1074,24 @@ class AIProcessor:
             )
             
         except Exception as e:
-            logger.error(f"English response error: {str(e)}")
+            logger.error("Response error (%s): %s", language, e)
             return AIResponse(
-                text=f"Thanks for your message! Someone from our team will get back to you shortly.",
+                text=_ERROR_REPLIES[language],
                 confidence=0.6,
                 intent=intent.intent
-            )
\ No newline at end of file
+            )
+
+# One processor per process: the keyword automatons, prompt caches and Gemini
+# client are built once and shared (the model client is safe to share across
+# tasks; construction is guarded so concurrent first callers build it once)
+_processor: Optional[AIProcessor] = None
+_processor_lock = threading.Lock()
+
+def get_processor() -> AIProcessor:
+    """Get the shared AIProcessor, creating it on first use"""
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = AIProcessor()
+    return _processor
@@ -6,14 +6,303 @@ Handles business data, conversations, and analytics with proper async support
 
 import os
 import json
+import asyncio
 import sqlite3
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from cachetools import TTLCache
+
+from db_pool import get_conn, get_reader
+
+# orjson (Rust) is several times faster for the JSON columns; values stay TEXT
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Hot-path SQL kept as a single string object so sqlite3's statement cache
+# (keyed by SQL text) always hits
+# SQLite's json1 validates and minifies the three JSON columns and folds them
+# into one document (invalid or NULL become []/{}), so Python does a single
+# parse instead of three guarded ones
+_SQL_GET_BUSINESS_BY_PHONE = """
+    SELECT id, name, phone, type, hours, address, created_at,
+        json_object(
+            'services', CASE WHEN json_valid(services) THEN json(services) ELSE json('[]') END,
+            'faq_data', CASE WHEN json_valid(faq_data) THEN json(faq_data) ELSE json('{}') END,
+            'pricing_data', CASE WHEN json_valid(pricing_data) THEN json(pricing_data) ELSE json('{}') END
+        ) as json_fields
+    FROM businesses WHERE phone = ?
+"""
+_SQL_INSERT_CONVERSATION = """
+    INSERT INTO conversations 
+    (business_id, customer_phone, platform, inbound_message, outbound_message, 
+     intent, ai_confidence, escalated, response_time_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_BOOKING = """
+    INSERT INTO bookings 
+    (business_id, customer_phone, customer_name, service, 
+     scheduled_datetime, duration_minutes, status, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_UPDATE_BOOKING_STATUS = "UPDATE bookings SET status = ? WHERE id = ?"
+# The look-back window is a bound parameter ('-7 days'), not spliced into the
+# text, so every window size shares one cached statement
+_SQL_CONVERSATION_STATS = """
+    SELECT 
+        COUNT(*) as total_conversations,
+        COUNT(CASE WHEN DATE(timestamp) = DATE('now') THEN 1 END) as today_count,
+        AVG(response_time_ms) as avg_response_time,
+        AVG(ai_confidence) as avg_confidence,
+        COUNT(CASE WHEN escalated = 1 THEN 1 END) as escalated_count
+    FROM conversations 
+    WHERE business_id = ? AND timestamp > datetime('now', ?)
+"""
+# One statement with or without a metric filter (NULL matches every metric)
+_SQL_GET_ANALYTICS = """
+    SELECT metric_name, metric_value, metadata, timestamp
+    FROM analytics 
+    WHERE business_id = ? AND (? IS NULL OR metric_name = ?)
+    AND timestamp > datetime('now', ?)
+    ORDER BY timestamp DESC
+"""
+# JSON list reads are serialized by SQLite itself, so the dashboard can hand the
+# bytes straight to the response. An aggregate has no defined input order, so
+# json_group_array runs as a window over the whole (limited) result with its own
+# ORDER BY, and the first row carries the complete array.
+_JSON_ARRAY_WINDOW = "ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING"
+_SQL_RECENT_CONVERSATIONS_JSON = """
+    SELECT json_group_array(json_object(
+        'customer', coalesce(nullif(substr(customer_phone, -4), ''), 'Unknown'),
+        'inbound', CASE WHEN length(inbound_message) > 100
+            THEN substr(inbound_message, 1, 100) || '...' ELSE inbound_message END,
+        'outbound', CASE WHEN length(outbound_message) > 100
+            THEN substr(outbound_message, 1, 100) || '...' ELSE outbound_message END,
+        'intent', intent,
+        'confidence', ai_confidence,
+        'timestamp', timestamp,
+        'escalated', json(CASE WHEN escalated THEN 'true' ELSE 'false' END),
+        'platform', platform
+    )) OVER (ORDER BY timestamp DESC, id DESC {window})
+    FROM (
+        SELECT * FROM conversations 
+        WHERE business_id = ? 
+        ORDER BY timestamp DESC, id DESC 
+        LIMIT ?
+    )
+    LIMIT 1
+""".format(window=_JSON_ARRAY_WINDOW)
+_SQL_BOOKINGS_JSON = """
+    SELECT json_group_array(json_object(
+        'id', id,
+        'customer_phone', customer_phone,
+        'customer_name', customer_name,
+        'service', service,
+        'scheduled_datetime', scheduled_datetime,
+        'duration_minutes', duration_minutes,
+        'status', status,
+        'notes', notes,
+        'created_at', created_at
+    )) OVER (ORDER BY scheduled_datetime DESC, id DESC {window})
+    FROM (
+        SELECT * FROM bookings 
+        WHERE business_id = ? 
+        ORDER BY scheduled_datetime DESC, id DESC 
+        LIMIT ?
+    )
+    LIMIT 1
+""".format(window=_JSON_ARRAY_WINDOW)
+_SQL_GET_ANALYTICS_JSON = """
+    SELECT json_group_array(json_object(
+        'metric_name', metric_name,
+        'metric_value', metric_value,
+        'metadata', CASE WHEN json_valid(metadata) THEN json(metadata) END,
+        'timestamp', timestamp
+    )) OVER (ORDER BY timestamp DESC, id DESC {window})
+    FROM analytics 
+    WHERE business_id = ? AND (? IS NULL OR metric_name = ?)
+    AND timestamp > datetime('now', ?)
+    LIMIT 1
+""".format(window=_JSON_ARRAY_WINDOW)
+_SQL_INSERT_ANALYTICS = """
+    INSERT INTO analytics 
+    (business_id, metric_name, metric_value, metadata)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Parsed business rows keyed by (db_path, phone); shared by every Database
+# instance. Business config changes rarely, so a short TTL bounds staleness.
+_business_cache: TTLCache = TTLCache(maxsize=128, ttl=60)
+# Numbers with no business; short TTL so a newly added business shows up quickly
+_missing_business_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_business_cache_lock = threading.Lock()
+
+# Columns update_business may set (names are interpolated into the SQL)
+_BUSINESS_UPDATABLE = frozenset(('name', 'type', 'services', 'hours', 'address', 'faq_data', 'pricing_data'))
+
+# Window and refresh period of the intent_summary table (popular questions)
+INTENT_SUMMARY_DAYS = 30
+INTENT_SUMMARY_REFRESH_SECONDS = 3600
+# Every worker process runs the refresh loop; whichever claims the
+# intent_summary_refresh row first rebuilds, and the rest skip any refresh
+# attempted within half a period of that one
+_SQL_CLAIM_INTENT_SUMMARY_REFRESH = """
+    INSERT INTO intent_summary_refresh (id, refreshed_at) VALUES (1, CURRENT_TIMESTAMP)
+    ON CONFLICT (id) DO UPDATE SET refreshed_at = excluded.refreshed_at
+    WHERE refreshed_at <= datetime('now', ?)
+"""
+
+# Conversation/analytics INSERTs are grouped: up to WRITE_BATCH_SIZE rows,
+# or whatever arrived within WRITE_FLUSH_SECONDS, commit together
+WRITE_BATCH_SIZE = 100
+WRITE_FLUSH_SECONDS = 0.02
+
+# Every write goes through the shared connection one transaction at a time
+# (executor threads and the event loop alike)
+_write_lock = threading.Lock()
+
+# Writes run on their own single thread, so they queue behind each other there
+# instead of holding default-executor threads that reads could be using
+_write_executor: Optional[ThreadPoolExecutor] = None
+_write_executor_lock = threading.Lock()
+
+def _get_write_executor() -> ThreadPoolExecutor:
+    """Get the single-thread writer executor, starting it on first use"""
+    global _write_executor
+    with _write_executor_lock:
+        if _write_executor is None:
+            _write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        return _write_executor
+
+def shutdown_writer() -> None:
+    """Let queued writes finish on the writer thread, then stop it (call on
+    shutdown, before the pooled connections are closed)"""
+    global _write_executor
+    with _write_executor_lock:
+        executor, _write_executor = _write_executor, None
+    if executor:
+        executor.shutdown(wait=True)
+
+async def _run_write(fn, *args):
+    """Run a blocking write on the writer thread without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(_get_write_executor(), fn, *args)
+
+def _reset_after_fork() -> None:
+    """Drop the parent's writer thread and lock in a forked worker"""
+    global _write_executor, _write_executor_lock, _write_lock
+    _write_executor = None
+    _write_executor_lock = threading.Lock()
+    _write_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+class _BatchWriter:
+    """Coalesces single-row INSERTs into executemany batches, one transaction per flush
+    
+    Rows wait at most WRITE_FLUSH_SECONDS for company (or until WRITE_BATCH_SIZE
+    are queued), so a burst of SMS costs one commit instead of one per message
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def write(self, sql: str, params: tuple) -> bool:
+        """Queue one row and wait for its batch to commit (False if the batch failed)"""
+        if self._task is None or self._task.done():
+            # Started lazily: the queue and task belong to the running loop
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run(self._queue))
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((sql, params, future))
+        return await future
+    
+    async def flush(self) -> None:
+        """Wait for every queued row to be written, then stop the writer task"""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.join()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+    
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Collect a batch, write it on the writer thread, resolve its waiters"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + WRITE_FLUSH_SECONDS
+            while len(batch) < WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await _run_write(self._write_sync, batch)
+            except Exception as e:
+                logger.error(f"Batched write error ({len(batch)} rows): {str(e)}")
+                results = [False] * len(batch)
+            for (_, _, future), ok in zip(batch, results):
+                if not future.done():
+                    future.set_result(ok)
+                queue.task_done()
+    
+    def _write_sync(self, batch: List[tuple]) -> List[bool]:
+        """executemany each statement's rows inside a single write transaction
+        
+        If the batch fails, rows are retried one transaction each so a single
+        bad row doesn't cost the others; returns per-row success
+        """
+        rows_by_sql: Dict[str, List[tuple]] = {}
+        for sql, params, _ in batch:
+            rows_by_sql.setdefault(sql, []).append(params)
+        
+        conn = get_conn(self.db_path)
+        with _write_lock:
+            try:
+                for sql, rows in rows_by_sql.items():
+                    conn.executemany(sql, rows)
+                conn.commit()
+                return [True] * len(batch)
+            except Exception as e:
+                conn.rollback()
+                if len(batch) == 1:
+                    raise
+                logger.warning(f"Batched write failed, retrying {len(batch)} rows singly: {str(e)}")
+            
+            results = []
+            for sql, params, _ in batch:
+                try:
+                    conn.execute(sql, params)
+                    conn.commit()
+                    results.append(True)
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Batched write error: {str(e)}")
+                    results.append(False)
+            return results
+
 @dataclass
 class Business:
     """Business data structure"""
@@ -32,13 +321,16 @@ class Database:
     
     def __init__(self, db_path: str = "localai.db"):
         self.db_path = db_path
+        self._writer = _BatchWriter(db_path)
         self.init_database()
     
-    def get_connection(self):
-        """Get database connection (synchronous)"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def get_connection(self) -> sqlite3.Connection:
+        """Get the shared pooled writer connection (synchronous, never close it)"""
+        return get_conn(self.db_path)
+    
+    def get_read_connection(self) -> sqlite3.Connection:
+        """Get a pooled read-only connection (round-robin, never close it)"""
+        return get_reader(self.db_path)
     
     def init_database(self):
         """Initialize SQLite database with required tables"""
@@ -46,12 +338,16 @@ class Database:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            # Schema and demo seed share one transaction (DDL would
+            # otherwise autocommit statement by statement)
+            cursor.execute("BEGIN")
+            
             # Businesses table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS businesses (
                     id TEXT PRIMARY KEY,
                     name TEXT NOT NULL,
-                    phone TEXT UNIQUE NOT NULL,
+                    phone TEXT UNIQUE NOT NULL,  -- UNIQUE autoindex serves get_business_by_phone
                     type TEXT DEFAULT 'service',
                     services TEXT,  -- JSON array
                     hours TEXT DEFAULT 'Mon-Fri 9am-6pm',
@@ -110,23 +406,49 @@ class Database:
                 )
             """)
             
-            conn.commit()
-            conn.close()
+            # Indexes for the per-business range/sort reads (stats, recent
+            # conversations, bookings, analytics) and the all-business
+            # "since midnight" dashboard counts
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_conv_biz_ts ON conversations (business_id, timestamp DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_conv_ts ON conversations (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_book_biz_sched ON bookings (business_id, scheduled_datetime DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_anal_biz_metric_ts ON analytics (business_id, metric_name, timestamp DESC)")
+            
+            # Per-business intent counts over the last INTENT_SUMMARY_DAYS,
+            # rebuilt hourly so popular questions don't scan conversations
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS intent_summary (
+                    business_id TEXT NOT NULL,
+                    intent TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (business_id, intent)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS intent_summary_refresh (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    refreshed_at TIMESTAMP NOT NULL
+                )
+            """)
             
             # Create demo business
-            self.ensure_demo_business()
+            self.ensure_demo_business(cursor)
+            
+            conn.commit()
+            
+            # Refresh planner statistics so the indexes are chosen; the
+            # analysis limit keeps this a bounded sample on large tables
+            conn.execute("PRAGMA analysis_limit=400")
+            conn.execute("ANALYZE")
             logger.info("Database initialized successfully")
             
         except Exception as e:
             logger.error(f"Database initialization error: {str(e)}")
             raise
     
-    def ensure_demo_business(self):
-        """Create demo business for testing"""
+    def ensure_demo_business(self, cursor: sqlite3.Cursor):
+        """Create demo business for testing (inside the caller's transaction)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
             cursor.execute("SELECT COUNT(*) FROM businesses")
             count = cursor.fetchone()[0]
             
@@ -136,90 +458,142 @@ class Database:
                     'name': 'Bella Hair Salon',
                     'phone': os.getenv('TWILIO_PHONE_NUMBER', '+1234567890'),
                     'type': 'hair_salon',
-                    'services': json.dumps(['haircut', 'coloring', 'styling', 'treatment', 'blowout']),
+                    'services': ['haircut', 'coloring', 'styling', 'treatment', 'blowout'],
                     'hours': 'Mon-Sat 9am-7pm, Closed Sunday',
                     'address': '123 Main Street, Anytown, ST 12345',
-                    'faq_data': json.dumps({
+                    'faq_data': {
                         'hours': 'We are open Monday through Saturday 9am-7pm, closed Sunday',
                         'parking': 'Free parking available in our rear lot',
                         'payment': 'We accept cash, all major credit cards, and mobile payments',
                         'cancellation': '24 hour notice required for cancellations to avoid fees',
                         'walk_ins': 'Walk-ins welcome when stylists are available'
-                    }),
-                    'pricing_data': json.dumps({
+                    },
+                    'pricing_data': {
                         'haircut': '$45-65',
                         'coloring': '$85-150',
                         'styling': '$35-50',
                         'treatment': '$60-100',
                         'blowout': '$30-40'
-                    })
+                    }
                 }
                 
-                cursor.execute("""
-                    INSERT INTO businesses (id, name, phone, type, services, hours, address, faq_data, pricing_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    demo_business['id'], demo_business['name'], demo_business['phone'],
-                    demo_business['type'], demo_business['services'], demo_business['hours'],
-                    demo_business['address'], demo_business['faq_data'], demo_business['pricing_data']
-                ))
-                
-                conn.commit()
+                self.seed_businesses(cursor, [demo_business])
                 logger.info("Demo business created successfully")
             
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Demo business creation error: {str(e)}")
     
+    def seed_businesses(self, cursor: sqlite3.Cursor, businesses: List[Dict]) -> None:
+        """Insert business records in one executemany (single prepared statement)"""
+        rows = [
+            (
+                b['id'], b['name'], b['phone'], b.get('type', 'service'),
+                _dumps(b.get('services', [])), b.get('hours'), b.get('address'),
+                _dumps(b.get('faq_data', {})), _dumps(b.get('pricing_data', {}))
+            )
+            for b in businesses
+        ]
+        cursor.executemany("""
+            INSERT INTO businesses (id, name, phone, type, services, hours, address, faq_data, pricing_data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    
     async def get_business_by_phone(self, phone: str) -> Optional[Dict]:
-        """Get business by phone number"""
+        """Get business by phone number (served from cache when fresh)"""
+        key = (self.db_path, phone)
+        with _business_cache_lock:
+            business = _business_cache.get(key)
+            missing = key in _missing_business_cache
+        if business is not None:
+            return dict(business)
+        if missing:
+            return None
+        
+        # Cache miss: the query runs off the event loop
+        return await asyncio.to_thread(self._get_business_by_phone_sync, phone)
+    
+    def _get_business_by_phone_sync(self, phone: str) -> Optional[Dict]:
+        """Blocking lookup behind get_business_by_phone (fills the cache)"""
+        key = (self.db_path, phone)
         try:
-            conn = self.get_connection()
+            conn = self.get_read_connection()
             cursor = conn.cursor()
             
-            cursor.execute("SELECT * FROM businesses WHERE phone = ?", (phone,))
+            cursor.execute(_SQL_GET_BUSINESS_BY_PHONE, (phone,))
             row = cursor.fetchone()
-            conn.close()
             
             if row:
                 business = dict(row)
-                # Parse JSON fields safely
-                try:
-                    business['services'] = json.loads(business['services'] or '[]')
-                except (json.JSONDecodeError, TypeError):
-                    business['services'] = []
-                
-                try:
-                    business['faq_data'] = json.loads(business['faq_data'] or '{}')
-                except (json.JSONDecodeError, TypeError):
-                    business['faq_data'] = {}
+                # JSON fields arrive pre-validated as one document (parsed once per cache fill)
+                business.update(_loads(business.pop('json_fields')))
                 
-                try:
-                    business['pricing_data'] = json.loads(business['pricing_data'] or '{}')
-                except (json.JSONDecodeError, TypeError):
-                    business['pricing_data'] = {}
-                
-                return business
+                with _business_cache_lock:
+                    _business_cache[key] = business
+                return dict(business)
             
+            with _business_cache_lock:
+                _missing_business_cache[key] = True
             return None
             
         except Exception as e:
             logger.error(f"Error getting business by phone: {str(e)}")
             return None
     
-    async def log_conversation(self, conversation_data: Dict, response_time_ms: int = None) -> bool:
-        """Log conversation with performance metrics"""
+    def invalidate_business_cache(self) -> None:
+        """Drop cached business rows (call after any write to businesses)"""
+        with _business_cache_lock:
+            _business_cache.clear()
+            _missing_business_cache.clear()
+    
+    async def update_business(self, business_id: str, updates: Dict) -> bool:
+        """Update business columns (JSON columns pre-serialized) and drop cached rows"""
+        columns = [column for column in updates if column in _BUSINESS_UPDATABLE]
+        if not columns:
+            return True
+        
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            await _run_write(
+                self._execute_write_sync,
+                f"UPDATE businesses SET {assignments} WHERE id = ?",
+                tuple(updates[column] for column in columns) + (business_id,)
+            )
+            self.invalidate_business_cache()
+            return True
             
-            cursor.execute("""
-                INSERT INTO conversations 
-                (business_id, customer_phone, platform, inbound_message, outbound_message, 
-                 intent, ai_confidence, escalated, response_time_ms)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        except Exception as e:
+            logger.error(f"Update business error: {str(e)}")
+            return False
+    
+    def _execute_write_sync(self, sql: str, params: tuple) -> Tuple[Optional[int], int]:
+        """Run one write statement and commit it; returns (lastrowid, rowcount)"""
+        conn = self.get_connection()
+        with _write_lock:
+            cursor = conn.execute(sql, params)
+            conn.commit()
+        return cursor.lastrowid, cursor.rowcount
+    
+    async def append_faq(self, business_id: str, faq_key: str, faq_value: Dict) -> bool:
+        """Set one FAQ entry inside faq_data in a single UPDATE (no read-modify-write)"""
+        # Quoted JSON path member; quotes and backslashes can't appear inside it
+        path = '$."{}"'.format(faq_key.replace('"', '').replace('\\', ''))
+        try:
+            _, rowcount = await _run_write(self._execute_write_sync, """
+                UPDATE businesses
+                SET faq_data = json_set(COALESCE(NULLIF(faq_data, ''), '{}'), ?, json(?))
+                WHERE id = ?
+            """, (path, _dumps(faq_value), business_id))
+            self.invalidate_business_cache()
+            return rowcount > 0
+            
+        except Exception as e:
+            logger.error(f"Append FAQ error: {str(e)}")
+            return False
+    
+    async def log_conversation(self, conversation_data: Dict, response_time_ms: int = None) -> bool:
+        """Log conversation with performance metrics (batched with other pending writes)"""
+        try:
+            return await self._writer.write(_SQL_INSERT_CONVERSATION, (
                 conversation_data.get('business_id'),
                 conversation_data.get('customer_phone'),
                 conversation_data.get('platform', 'sms'),
@@ -231,33 +605,28 @@ class Database:
                 response_time_ms
             ))
             
-            conn.commit()
-            conn.close()
-            return True
-            
         except Exception as e:
             logger.error(f"Conversation logging error: {str(e)}")
             return False
     
+    async def flush(self) -> None:
+        """Commit every queued conversation/analytics row (call on shutdown)"""
+        await self._writer.flush()
+    
     async def get_conversation_stats(self, business_id: str, days: int = 7) -> Dict:
-        """Get conversation statistics"""
+        """Get conversation statistics (runs on the default executor)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_conversation_stats_sync, business_id, days)
+    
+    def _get_conversation_stats_sync(self, business_id: str, days: int = 7) -> Dict:
+        """Blocking query behind get_conversation_stats"""
         try:
-            conn = self.get_connection()
+            conn = self.get_read_connection()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_conversations,
-                    COUNT(CASE WHEN DATE(timestamp) = DATE('now') THEN 1 END) as today_count,
-                    AVG(response_time_ms) as avg_response_time,
-                    AVG(ai_confidence) as avg_confidence,
-                    COUNT(CASE WHEN escalated = 1 THEN 1 END) as escalated_count
-                FROM conversations 
-                WHERE business_id = ? AND timestamp > datetime('now', '-{} days')
-            """.format(days), (business_id,))
+            cursor.execute(_SQL_CONVERSATION_STATS, (business_id, f"-{int(days)} days"))
             
             result = cursor.fetchone()
-            conn.close()
             
             if result:
                 return {
@@ -274,10 +643,130 @@ class Database:
             logger.error(f"Stats query error: {str(e)}")
             return {}
     
+    async def get_weekly_stats(self, business_id: str, start_date: datetime) -> Dict[str, Dict]:
+        """Per-day conversation counts since start_date in one GROUP BY query
+        
+        Returns {'YYYY-MM-DD': {...}}; days without conversations are absent.
+        Runs on the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_weekly_stats_sync, business_id, start_date)
+    
+    def _get_weekly_stats_sync(self, business_id: str, start_date: datetime) -> Dict[str, Dict]:
+        """Blocking query behind get_weekly_stats"""
+        try:
+            conn = self.get_read_connection()
+            rows = conn.execute("""
+                SELECT 
+                    DATE(timestamp) as day,
+                    COUNT(CASE WHEN platform = 'voice' THEN 1 END) as voice_calls,
+                    COUNT(CASE WHEN platform = 'sms' THEN 1 END) as sms_messages,
+                    COUNT(CASE WHEN escalated = 1 THEN 1 END) as escalations,
+                    AVG(ai_confidence) as ai_confidence
+                FROM conversations 
+                WHERE business_id = ? AND timestamp >= ?
+                GROUP BY day
+            """, (business_id, start_date.strftime('%Y-%m-%d'))).fetchall()
+            
+            return {
+                row['day']: {
+                    'voice_calls': row['voice_calls'],
+                    'sms_messages': row['sms_messages'],
+                    'escalations': row['escalations'],
+                    'ai_confidence': row['ai_confidence']
+                }
+                for row in rows
+            }
+            
+        except Exception as e:
+            logger.error(f"Weekly stats query error: {str(e)}")
+            raise
+    
+    async def get_top_intents(self, business_id: str, limit: int = 5) -> List[Dict]:
+        """Most frequent intents over the last INTENT_SUMMARY_DAYS, with the period's total
+        
+        Reads the small intent_summary table (rebuilt hourly by
+        keep_intent_summary_fresh) instead of scanning conversations.
+        Runs on the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_top_intents_sync, business_id, limit)
+    
+    def _get_top_intents_sync(self, business_id: str, limit: int = 5) -> List[Dict]:
+        """Blocking query behind get_top_intents"""
+        try:
+            conn = self.get_read_connection()
+            rows = conn.execute("""
+                SELECT intent, count,
+                       (SELECT SUM(count) FROM intent_summary WHERE business_id = ?) as total
+                FROM intent_summary
+                WHERE business_id = ?
+                ORDER BY count DESC
+                LIMIT ?
+            """, (business_id, business_id, limit)).fetchall()
+            
+            return [
+                {"intent": row['intent'], "count": row['count'], "total": row['total']}
+                for row in rows
+            ]
+            
+        except Exception as e:
+            logger.error(f"Top intents query error: {str(e)}")
+            raise
+    
+    async def refresh_intent_summary(self) -> bool:
+        """Rebuild intent_summary from the last INTENT_SUMMARY_DAYS of conversations"""
+        try:
+            await _run_write(self._refresh_intent_summary_sync)
+            return True
+        except Exception as e:
+            logger.error(f"Intent summary refresh error: {str(e)}")
+            return False
+    
+    def _refresh_intent_summary_sync(self) -> None:
+        """Blocking rebuild behind refresh_intent_summary (one write transaction)
+        
+        The claim is the transaction's first write, so it holds the database
+        write lock: a worker racing this one waits, then sees the fresh claim
+        and skips its own rebuild.
+        """
+        conn = self.get_connection()
+        with _write_lock:
+            try:
+                claimed = conn.execute(
+                    _SQL_CLAIM_INTENT_SUMMARY_REFRESH, (f"-{INTENT_SUMMARY_REFRESH_SECONDS // 2} seconds",)
+                ).rowcount
+                if not claimed:
+                    conn.rollback()
+                    return
+                conn.execute("DELETE FROM intent_summary")
+                conn.execute("""
+                    INSERT INTO intent_summary (business_id, intent, count)
+                    SELECT business_id, COALESCE(intent, 'general'), COUNT(*)
+                    FROM conversations 
+                    WHERE business_id IS NOT NULL AND timestamp > datetime('now', ?)
+                    GROUP BY 1, 2
+                """, (f"-{INTENT_SUMMARY_DAYS} days",))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    async def keep_intent_summary_fresh(self):
+        """Refresh intent_summary now, then every INTENT_SUMMARY_REFRESH_SECONDS (run as a background task)"""
+        while True:
+            await self.refresh_intent_summary()
+            await asyncio.sleep(INTENT_SUMMARY_REFRESH_SECONDS)
+    
     async def get_recent_conversations(self, business_id: str, limit: int = 20) -> List[Dict]:
-        """Get recent conversations"""
+        """Get recent conversations (runs on the default executor)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_recent_conversations_sync, business_id, limit)
+    
+    def _get_recent_conversations_sync(self, business_id: str, limit: int = 20) -> List[Dict]:
+        """Blocking query behind get_recent_conversations"""
         try:
-            conn = self.get_connection()
+            conn = self.get_read_connection()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -297,7 +786,6 @@ class Database:
             """, (business_id, limit))
             
             results = cursor.fetchall()
-            conn.close()
             
             conversations = []
             for row in results:
@@ -318,18 +806,72 @@ class Database:
             logger.error(f"Recent conversations query error: {str(e)}")
             return []
     
+    async def get_recent_conversations_json(self, business_id: str, limit: int = 20) -> bytes:
+        """Get recent conversations as a JSON array built by SQLite (runs on the default executor)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._json_list_sync, _SQL_RECENT_CONVERSATIONS_JSON,
+                                          (business_id, limit), "Recent conversations")
+    
+    def _json_list_sync(self, sql: str, params: tuple, label: str) -> bytes:
+        """Run a windowed json_group_array query; no rows or any failure yields an empty array"""
+        try:
+            row = self.get_read_connection().execute(sql, params).fetchone()
+            return row[0].encode() if row and row[0] else b"[]"
+        except Exception as e:
+            logger.error(f"{label} query error: {str(e)}")
+            return b"[]"
+    
+    def _scalar_sync(self, sql: str, params: tuple) -> int:
+        """Run a single-value read query on a pooled reader connection"""
+        row = self.get_read_connection().execute(sql, params).fetchone()
+        return (row[0] or 0) if row else 0
+    
+    async def _count(self, sql: str, params: tuple, label: str) -> int:
+        """Run a COUNT query on the default executor so concurrent counts overlap"""
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._scalar_sync, sql, params)
+        except Exception as e:
+            logger.error(f"{label} count query error: {str(e)}")
+            return 0
+    
+    async def get_conversation_counts(self, business_id: str, since: datetime) -> Dict[str, int]:
+        """Count a business's voice, SMS and French conversations since a timestamp in one query
+        
+        Conversations don't store their language, so French is recognised the
+        same way the dashboard feed does it: by a greeting in the inbound text.
+        Runs on the default executor.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._get_conversation_counts_sync, business_id, since)
+        except Exception as e:
+            logger.error(f"Conversation counts query error: {str(e)}")
+            return {'voice': 0, 'sms': 0, 'french': 0}
+    
+    def _get_conversation_counts_sync(self, business_id: str, since: datetime) -> Dict[str, int]:
+        """Blocking query behind get_conversation_counts"""
+        row = self.get_read_connection().execute("""
+            SELECT 
+                COUNT(CASE WHEN platform = 'voice' THEN 1 END) as voice,
+                COUNT(CASE WHEN platform = 'sms' THEN 1 END) as sms,
+                COUNT(CASE WHEN LOWER(inbound_message) LIKE '%bonjour%' THEN 1 END) as french
+            FROM conversations
+            WHERE business_id = ? AND timestamp >= ?
+        """, (business_id, since.isoformat(sep=' '))).fetchone()
+        return {'voice': row['voice'], 'sms': row['sms'], 'french': row['french']}
+    
+    async def get_escalated_conversations_count(self, business_id: str, since: datetime) -> int:
+        """Count escalated conversations for a business since a timestamp"""
+        return await self._count("""
+            SELECT COUNT(*) FROM conversations
+            WHERE business_id = ? AND escalated = 1 AND timestamp >= ?
+        """, (business_id, since.isoformat(sep=' ')), "Escalation")
+    
     async def create_booking(self, booking_data: Dict) -> Optional[int]:
         """Create a new booking"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO bookings 
-                (business_id, customer_phone, customer_name, service, 
-                 scheduled_datetime, duration_minutes, status, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            booking_id, _ = await _run_write(self._execute_write_sync, _SQL_INSERT_BOOKING, (
                 booking_data.get('business_id'),
                 booking_data.get('customer_phone'),
                 booking_data.get('customer_name'),
@@ -340,10 +882,6 @@ class Database:
                 booking_data.get('notes', '')
             ))
             
-            booking_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
             logger.info(f"Booking created successfully: {booking_id}")
             return booking_id
             
@@ -352,9 +890,14 @@ class Database:
             return None
     
     async def get_bookings_for_business(self, business_id: str, limit: int = 50) -> List[Dict]:
-        """Get bookings for a business"""
+        """Get bookings for a business (runs on the default executor)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_bookings_for_business_sync, business_id, limit)
+    
+    def _get_bookings_for_business_sync(self, business_id: str, limit: int = 50) -> List[Dict]:
+        """Blocking query behind get_bookings_for_business"""
         try:
-            conn = self.get_connection()
+            conn = self.get_read_connection()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -369,7 +912,6 @@ class Database:
             """, (business_id, limit))
             
             results = cursor.fetchall()
-            conn.close()
             
             bookings = []
             for row in results:
@@ -391,20 +933,16 @@ class Database:
             logger.error(f"Get bookings error: {str(e)}")
             return []
     
+    async def get_bookings_for_business_json(self, business_id: str, limit: int = 50) -> bytes:
+        """Get bookings for a business as a JSON array built by SQLite"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._json_list_sync, _SQL_BOOKINGS_JSON,
+                                          (business_id, limit), "Get bookings")
+    
     async def update_booking_status(self, booking_id: int, status: str) -> bool:
         """Update booking status"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE bookings 
-                SET status = ?
-                WHERE id = ?
-            """, (status, booking_id))
-            
-            conn.commit()
-            conn.close()
+            await _run_write(self._execute_write_sync, _SQL_UPDATE_BOOKING_STATUS, (status, booking_id))
             
             logger.info(f"Booking {booking_id} status updated to {status}")
             return True
@@ -414,62 +952,41 @@ class Database:
             return False
     
     async def log_analytics(self, business_id: str, metric_name: str, metric_value: float, metadata: Dict = None) -> bool:
-        """Log analytics data"""
+        """Log analytics data (batched with other pending writes)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO analytics 
-                (business_id, metric_name, metric_value, metadata)
-                VALUES (?, ?, ?, ?)
-            """, (
+            return await self._writer.write(_SQL_INSERT_ANALYTICS, (
                 business_id,
                 metric_name,
                 metric_value,
-                json.dumps(metadata) if metadata else None
+                _dumps(metadata) if metadata else None
             ))
             
-            conn.commit()
-            conn.close()
-            return True
-            
         except Exception as e:
             logger.error(f"Analytics logging error: {str(e)}")
             return False
     
     async def get_analytics(self, business_id: str, metric_name: str = None, days: int = 30) -> List[Dict]:
-        """Get analytics data"""
+        """Get analytics data (runs on the default executor)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_analytics_sync, business_id, metric_name, days)
+    
+    def _get_analytics_sync(self, business_id: str, metric_name: str = None, days: int = 30) -> List[Dict]:
+        """Blocking query behind get_analytics"""
         try:
-            conn = self.get_connection()
+            conn = self.get_read_connection()
             cursor = conn.cursor()
             
-            if metric_name:
-                cursor.execute("""
-                    SELECT metric_name, metric_value, metadata, timestamp
-                    FROM analytics 
-                    WHERE business_id = ? AND metric_name = ?
-                    AND timestamp > datetime('now', '-{} days')
-                    ORDER BY timestamp DESC
-                """.format(days), (business_id, metric_name))
-            else:
-                cursor.execute("""
-                    SELECT metric_name, metric_value, metadata, timestamp
-                    FROM analytics 
-                    WHERE business_id = ?
-                    AND timestamp > datetime('now', '-{} days')
-                    ORDER BY timestamp DESC
-                """.format(days), (business_id,))
+            metric_name = metric_name or None
+            cursor.execute(_SQL_GET_ANALYTICS, (business_id, metric_name, metric_name, f"-{int(days)} days"))
             
             results = cursor.fetchall()
-            conn.close()
             
             analytics = []
             for row in results:
                 analytics.append({
                     "metric_name": row['metric_name'],
                     "metric_value": row['metric_value'],
-                    "metadata": json.loads(row['metadata']) if row['metadata'] else None,
+                    "metadata": _loads(row['metadata']) if row['metadata'] else None,
                     "timestamp": row['timestamp']
                 })
             
@@ -477,4 +994,24 @@ class Database:
             
         except Exception as e:
             logger.error(f"Get analytics error: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+    
+    async def get_analytics_json(self, business_id: str, metric_name: str = None, days: int = 30) -> bytes:
+        """Get analytics data as a JSON array built by SQLite"""
+        metric_name = metric_name or None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._json_list_sync, _SQL_GET_ANALYTICS_JSON,
+                                          (business_id, metric_name, metric_name, f"-{int(days)} days"),
+                                          "Get analytics")
+
+_database: Optional[Database] = None
+_database_lock = threading.Lock()
+
+def get_database() -> Database:
+    """Get the shared Database, creating (and initializing) it on first use"""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = Database()
+    return _database
@@ -0,0 +1,102 @@
+# Shared SQLite connections
+"""
+LocalAI Assistant - SQLite Connection Pool
+Keeps one long-lived, tuned writer connection per database file (plus a few
+read-only reader connections) so the page cache survives between queries
+instead of being rebuilt on every connect()
+"""
+
+import os
+import sqlite3
+import logging
+import itertools
+import threading
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "localai.db"
+READER_COUNT = 4
+
+# Applied once when a connection is opened
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",       # 64 MB page cache
+    "PRAGMA mmap_size=268435456",     # 256 MB memory-mapped I/O
+)
+
+# Readers only need the cache/mmap settings; journal mode is set by the writer
+_READER_PRAGMAS = _PRAGMAS[2:]
+
+_connections: Dict[str, sqlite3.Connection] = {}
+_readers: Dict[str, List[sqlite3.Connection]] = {}
+_reader_cycles: Dict[str, Iterator[sqlite3.Connection]] = {}
+_lock = threading.Lock()
+
+def _open(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """Open a connection and apply the tuning PRAGMAs"""
+    # Large statement cache: hot queries reuse their compiled bytecode
+    if read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True,
+                               check_same_thread=False, cached_statements=256)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    for pragma in (_READER_PRAGMAS if read_only else _PRAGMAS):
+        conn.execute(pragma)
+    logger.info(f"SQLite {'reader' if read_only else 'connection'} opened: {db_path}")
+    return conn
+
+def get_conn(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Get the shared connection for db_path, opening it on first use"""
+    conn = _connections.get(db_path)
+    if conn is None:
+        with _lock:
+            conn = _connections.get(db_path)
+            if conn is None:
+                conn = _open(db_path)
+                _connections[db_path] = conn
+    return conn
+
+def get_reader(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Get a read-only connection for db_path, round-robin over READER_COUNT"""
+    cycle = _reader_cycles.get(db_path)
+    if cycle is None:
+        # The writer creates the file and switches it to WAL before readers attach
+        get_conn(db_path)
+        with _lock:
+            cycle = _reader_cycles.get(db_path)
+            if cycle is None:
+                readers = [_open(db_path, read_only=True) for _ in range(READER_COUNT)]
+                _readers[db_path] = readers
+                cycle = itertools.cycle(readers)
+                _reader_cycles[db_path] = cycle
+    return next(cycle)
+
+def _reset_after_fork() -> None:
+    """Forget the parent's connections in a forked worker; each process opens its own"""
+    global _lock
+    # Don't close them: the handles still belong to the parent process
+    _connections.clear()
+    _readers.clear()
+    _reader_cycles.clear()
+    _lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def close_all() -> None:
+    """Close every pooled connection (call on shutdown)"""
+    with _lock:
+        pooled = [(db_path, conn) for db_path, readers in _readers.items() for conn in readers]
+        pooled += list(_connections.items())
+        for db_path, conn in pooled:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing SQLite connection {db_path}: {str(e)}")
+        _readers.clear()
+        _reader_cycles.clear()
+        _connections.clear()
@@ -10,6 +10,7 @@ import json
 import logging
 import asyncio
 import base64
+import orjson
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from dotenv import load_dotenv
@@ -27,6 +28,9 @@ from twilio.twiml.voice_response import VoiceResponse, Start, Stream
 
 logger = logging.getLogger(__name__)
 
+# ~1 second of Twilio audio: 8 kHz mu-law, 1 byte per sample
+AUDIO_CHUNK_BYTES = 8000
+
 class EnhancedVoiceSystem:
     """Real-time voice conversation system with Google APIs + Gemini"""
     
@@ -253,13 +257,13 @@ class EnhancedVoiceSystem:
         """Generate AI response using existing AI processor"""
         try:
             # Import your existing AI processor
-            from ai_processor import AIProcessor
+            from ai_processor import get_processor
             
-            ai_processor = AIProcessor()
+            ai_processor = get_processor()
             
             # Get business context (using your existing database)
-            from database import Database
-            db = Database()
+            from database import get_database
+            db = get_database()
             business = await db.get_business_by_phone(self.phone_number)
             
             if not business:
@@ -332,8 +336,8 @@ class EnhancedVoiceSystem:
     async def save_conversation_log(self, call_sid: str, context: Dict):
         """Save voice conversation to database"""
         try:
-            from database import Database
-            db = Database()
+            from database import get_database
+            db = get_database()
             
             # Create conversation summary
             conversation_text = '\n'.join([
@@ -371,22 +375,23 @@ class VoiceStreamHandler:
         try:
             logger.info(f"🔗 Voice stream connected for call {call_sid}")
             
-            self.audio_buffer[call_sid] = []
+            # One growing buffer per call instead of a list of 20 ms frames
+            buffer = self.audio_buffer[call_sid] = bytearray()
+            stream_sid = None
             
-            async for message in websocket:
-                data = json.loads(message)
+            # Twilio Media Streams sends JSON text frames
+            async for message in websocket.iter_text():
+                data = orjson.loads(message)
+                event = data['event']
                 
-                if data['event'] == 'media':
+                if event == 'media':
                     # Decode audio data
-                    audio_data = base64.b64decode(data['media']['payload'])
-                    
-                    # Buffer audio until we have enough for processing
-                    self.audio_buffer[call_sid].append(audio_data)
+                    buffer += base64.b64decode(data['media']['payload'])
                     
                     # Process when we have ~1 second of audio
-                    if len(self.audio_buffer[call_sid]) >= 50:  # ~1 second at 8kHz
-                        combined_audio = b''.join(self.audio_buffer[call_sid])
-                        self.audio_buffer[call_sid] = []
+                    if len(buffer) >= AUDIO_CHUNK_BYTES:
+                        combined_audio = bytes(buffer)
+                        buffer.clear()
                         
                         # Process audio and get response
                         response_audio = await self.voice_system.handle_voice_stream(
@@ -395,32 +400,37 @@ class VoiceStreamHandler:
                         
                         if response_audio:
                             # Send response back to Twilio
-                            await self.send_audio_response(websocket, response_audio)
+                            await self.send_audio_response(websocket, response_audio, stream_sid)
+                
+                elif event == 'start':
+                    stream_sid = data.get('streamSid') or data.get('start', {}).get('streamSid')
                 
-                elif data['event'] == 'stop':
+                elif event == 'stop':
                     logger.info(f"📞 Voice stream ended for call {call_sid}")
                     await self.voice_system.handle_call_end(call_sid)
                     break
                     
         except Exception as e:
             logger.error(f"❌ WebSocket error: {str(e)}")
+        finally:
+            self.audio_buffer.pop(call_sid, None)
     
-    async def send_audio_response(self, websocket, audio_data: bytes):
+    async def send_audio_response(self, websocket, audio_data: bytes, stream_sid: Optional[str] = None):
         """Send audio response back to Twilio"""
         try:
             # Encode audio as base64
-            audio_b64 = base64.b64encode(audio_data).decode('utf-8')
+            audio_b64 = base64.b64encode(audio_data).decode('ascii')
             
             # Send to Twilio
             response = {
                 'event': 'media',
-                'streamSid': 'stream_id',
+                'streamSid': stream_sid or 'stream_id',
                 'media': {
                     'payload': audio_b64
                 }
             }
             
-            await websocket.send(json.dumps(response))
+            await websocket.send_text(orjson.dumps(response).decode())
             
         except Exception as e:
             logger.error(f"❌ Error sending audio response: {str(e)}")
\ No newline at end of file
@@ -5,6 +5,9 @@ Handles SMS sending and receiving via Twilio API
 """
 
 import os
+import hmac
+import base64
+import hashlib
 import logging
 from typing import Dict, Any, Optional
 from twilio.rest import Client
@@ -103,6 +106,20 @@ class TwilioSMS:
             logger.error(f"Webhook validation error: {str(e)}")
             return False
     
+    def validate_signature(self, url: str, params: Dict[str, str], signature: Optional[str]) -> bool:
+        """Check X-Twilio-Signature (HMAC-SHA1 of URL + sorted params) in constant time"""
+        if not self.auth_token:
+            # Nothing to verify against: fail closed rather than accept anything
+            logger.error("TWILIO_AUTH_TOKEN not set; rejecting webhook")
+            return False
+        if not signature:
+            return False
+        
+        payload = url + ''.join(key + params[key] for key in sorted(params))
+        digest = hmac.new(self.auth_token.encode('utf-8'), payload.encode('utf-8'), hashlib.sha1).digest()
+        expected = base64.b64encode(digest)
+        return hmac.compare_digest(expected, signature.encode('utf-8'))
+    
     async def get_message_status(self, message_sid: str) -> Dict[str, Any]:
         """Get status of a sent message"""
         try:
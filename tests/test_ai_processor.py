@@ -0,0 +1,64 @@
+# AI Processor Tests
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytest
+
+from ai_processor import AIProcessor, SMS_REPLY_CHARS, _prepare, _trim_reply
+
+class _SmallKeywordProcessor(AIProcessor):
+    """Short keyword lists, so scores are easy to reason about"""
+    def _load_intent_keywords(self):
+        return {
+            'booking': ('book', 'appointment', 'schedule'),
+            'faq': ('hours', 'open'),
+            'complaint': ('refund', 'manager'),
+            'cancellation': ('cancel', 'reschedule', 'postpone', 'move', 'change'),
+        }
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    return _SmallKeywordProcessor()
+
+def _classify(processor, message):
+    return processor._keyword_classify(_prepare(message, processor._keyword_ac))
+
+def test_short_reply_kept():
+    assert _trim_reply("  We're open 9am to 6pm.  ", SMS_REPLY_CHARS) == "We're open 9am to 6pm."
+
+def test_long_reply_cut_at_sentence_end():
+    first = "We're open Monday to Friday, 9am to 6pm."
+    second = "Saturdays we close early."
+    text = f"{first} {second} " + "Call us any time to book your next appointment " * 4
+    assert len(text) > SMS_REPLY_CHARS
+    assert _trim_reply(text, SMS_REPLY_CHARS) == f"{first} {second}"
+
+def test_decimal_point_is_not_a_sentence_end():
+    text = "A haircut is $45.50 and a color is $85.00 plus tax " * 4
+    trimmed = _trim_reply(text, SMS_REPLY_CHARS)
+    # No real sentence end within the limit: hard cut, not a cut after "$45."
+    assert trimmed == text[:SMS_REPLY_CHARS].rstrip()
+
+def test_sentence_end_exactly_at_limit():
+    text = "x" * (SMS_REPLY_CHARS - 1) + ". More text follows here"
+    assert _trim_reply(text, SMS_REPLY_CHARS) == "x" * (SMS_REPLY_CHARS - 1) + "."
+
+def test_highest_keyword_score_wins(processor):
+    # booking scores 2/3 and comes first in the table, but faq scores 2/2
+    intent, guess = _classify(processor, "book an appointment, what hours are you open")
+    assert intent.intent == guess == 'faq'
+    assert intent.confidence == 1.0
+
+def test_keyword_tie_goes_to_table_order(processor):
+    # faq and complaint both score 1/2: faq is listed first, whatever the message order
+    for message in ("refund please, and your hours", "your hours, and a refund please"):
+        intent, guess = _classify(processor, message)
+        assert intent.intent == guess == 'faq'
+
+def test_weak_keyword_match(processor):
+    # cancellation scores 1/5, not enough to classify, but is the only guess
+    assert _classify(processor, "can I move it") == (None, 'cancellation')
+    assert _classify(processor, "hello there") == (None, 'general')
@@ -0,0 +1,56 @@
+# Batched Write Tests
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from database import Database, shutdown_writer
+from db_pool import close_all
+
+def _conversation(i, customer_phone="+15145550000"):
+    return {
+        "business_id": "demo_salon_001",
+        "customer_phone": customer_phone,
+        "inbound_message": f"message {i}",
+        "outbound_message": f"reply {i}",
+        "intent": "faq",
+    }
+
+def _conversation_count(db):
+    return db.get_read_connection().execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "test.db"))
+    yield database
+    shutdown_writer()
+    close_all()
+
+def test_bad_row_fails_alone(db):
+    async def run():
+        rows = [_conversation(i) for i in range(5)]
+        # customer_phone is NOT NULL: this row fails the batch, then alone on retry
+        rows[2]["customer_phone"] = None
+        results = await asyncio.gather(*(db.log_conversation(row) for row in rows))
+        await db.flush()
+        return results
+
+    assert asyncio.run(run()) == [True, True, False, True, True]
+    assert _conversation_count(db) == 4
+
+def test_flush_drains_queue(db):
+    async def run():
+        tasks = [asyncio.create_task(db.log_conversation(_conversation(i))) for i in range(10)]
+        # Let every task queue its row, then flush without awaiting them
+        await asyncio.sleep(0)
+        await db.flush()
+        assert db._writer._queue.empty()
+        assert db._writer._task is None
+        assert all(task.done() for task in tasks)
+        return [task.result() for task in tasks]
+
+    assert asyncio.run(run()) == [True] * 10
+    assert _conversation_count(db) == 10
@@ -0,0 +1,48 @@
+# Twilio Signature Tests
+import os
+import sys
+import hmac
+import base64
+import hashlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from integrations.twilio_sms import TwilioSMS
+
+AUTH_TOKEN = "12345"
+URL = "https://example.com/webhook/voice"
+PARAMS = {"CallSid": "CA1234567890ABCDE", "From": "+12349013030", "To": "+18005551212"}
+
+def _sign(url, params, token=AUTH_TOKEN):
+    payload = url + "".join(key + params[key] for key in sorted(params))
+    return base64.b64encode(hmac.new(token.encode(), payload.encode(), hashlib.sha1).digest()).decode()
+
+def _twilio(monkeypatch, token=AUTH_TOKEN):
+    # Only the auth token is set, so no REST client is built
+    monkeypatch.delenv("TWILIO_ACCOUNT_SID", raising=False)
+    monkeypatch.delenv("TWILIO_PHONE_NUMBER", raising=False)
+    if token:
+        monkeypatch.setenv("TWILIO_AUTH_TOKEN", token)
+    else:
+        monkeypatch.delenv("TWILIO_AUTH_TOKEN", raising=False)
+    return TwilioSMS()
+
+def test_valid_signature(monkeypatch):
+    twilio = _twilio(monkeypatch)
+    assert twilio.validate_signature(URL, PARAMS, _sign(URL, PARAMS))
+
+def test_tampered_request(monkeypatch):
+    twilio = _twilio(monkeypatch)
+    signature = _sign(URL, PARAMS)
+    assert not twilio.validate_signature(URL, {**PARAMS, "From": "+15550000000"}, signature)
+    assert not twilio.validate_signature(URL + "?x=1", PARAMS, signature)
+    assert not twilio.validate_signature(URL, PARAMS, _sign(URL, PARAMS, token="other"))
+
+def test_missing_signature(monkeypatch):
+    twilio = _twilio(monkeypatch)
+    assert not twilio.validate_signature(URL, PARAMS, None)
+    assert not twilio.validate_signature(URL, PARAMS, "")
+
+def test_missing_auth_token(monkeypatch):
+    twilio = _twilio(monkeypatch, token=None)
+    assert not twilio.validate_signature(URL, PARAMS, _sign(URL, PARAMS))